@@ -0,0 +1,785 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    tkBoulderDash - Python3-Tkinter port of 'Boulder Dash' game
+
+    Python3-Tkinter port by Raphaël Seban <motus@laposte.net>
+
+    Copyright (c) 2014+ Raphaël Seban for the present code
+
+    This program is free software: you can redistribute it and/or
+    modify it under the terms of the GNU General Public License as
+    published by the Free Software Foundation, either version 3 of
+    the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+    General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.
+
+    If not, see http://www.gnu.org/licenses/
+"""
+
+# lib imports
+import os.path as OP
+import heapq
+import json
+import random
+from . import game_rules as GR
+
+
+class GameObject:
+    """
+        Headless game object living in a plain grid cell;
+        object @name follows sprite naming convention i.e.
+        TkBD{name}Sprite e.g. 'Rock', 'Diamond', 'Player', etc;
+    """
+
+    # class constants
+    # object name: (falling object, is_overable, is_movable)
+    TRAITS = {
+        "Barrier": (False, False, False),
+        "Diamond": (True, True, False),
+        "Earth": (False, True, False),
+        "GoldenKey": (True, True, False),
+        "Player": (False, False, False),
+        "PUDiamond": (True, True, False),
+        "Rock": (True, False, True),
+        "RockDiamond": (True, False, True),
+        "SyncBarrier": (False, False, False),
+        "Treasure": (True, False, True),
+        "Trophy": (True, False, True),
+        "Wall": (False, False, False),
+        "Water": (False, False, False),
+        "ZDiamond": (True, True, False),
+        "Zombie": (False, False, False),
+    }
+
+
+    def __init__ (self, name, role, row, column):
+        """
+            class constructor
+        """
+        # member inits
+        self.name = name
+        self.role = role
+        self.row = row
+        self.column = column
+        self.state = "default"
+        self.alive = True
+        self.falling, self.is_overable, self.is_movable = \
+            self.TRAITS.get(name) or (False, False, False)
+        self.is_falling = False
+        self.has_fallen = False
+        self.need_looping = False
+        self.direction = "right"
+        self.counter = 0
+    # end def
+
+
+    def __repr__ (self):
+        """
+            object representation;
+        """
+        return "<{} {} at ({}, {})>".format(
+            self.name, self.state, self.row, self.column
+        )
+    # end def
+
+# end class GameObject
+
+
+class GameEngine (GR.GameRules):
+    """
+        Headless game engine: runs level logic on a plain grid,
+        without any Tkinter dependency, one game step at a time;
+        falling objects physics follow game rules shared with
+        Tkinter sprites (see GameRules);
+    """
+
+    # class constants
+    TICK = 100                  # game step in milliseconds
+
+    # delays in game steps
+    COUNTDOWN_TICKS = 10        # 1 second
+    PLAYER_IDLE_TICKS = 5       # walking player gets idle
+    PLAYER_FROZEN_TICKS = 5     # 'frozen' image sequence
+    PLAYER_SPLASHED_TICKS = 9   # 'splashed' image sequence
+    ROCKDIAMOND_TICKS = 5       # 'change' image sequence
+    TREASURE_TICKS = 5          # treasure opening delay
+    TROPHY_TICKS = 3            # trophy opening delay
+    ZOMBIE_AI_TICKS = 8         # zombie AI loop delay
+    ZOMBIE_IDLE_TICKS = 10      # walking zombie gets idle
+    ZOMBIE_DIE_TICKS = 12       # 'die_xxx' image sequence
+
+    # player input moves
+    INPUTS = {
+        "Up": (-1, 0),
+        "Down": (+1, 0),
+        "Left": (0, -1),
+        "Right": (0, +1),
+    }
+
+    # collected objects scores
+    SCORES = {
+        "Diamond": 200,
+        "Earth": 50,
+        "GoldenKey": 500,
+        "PUDiamond": 500,
+        "RockDiamond": 200,
+        "Treasure": 1000,
+        "Trophy": 5000,
+        "ZDiamond": 500,
+    }
+
+
+    def __init__ (self, seed=None):
+        """
+            class constructor;
+            parameter @seed inits zombie AI random generator for
+            reproducible simulations;
+        """
+        # member inits
+        self.random = random.Random(seed)
+        self.reset()
+    # end def
+
+
+    def _changed (self, row, column):
+        """
+            protected method - keeps track of changed cell, both
+            for renderers (self.changes) and for game rules (see
+            pop_changes());
+        """
+        self.changes.add((row, column))
+        self.new_changes.add((row, column))
+    # end def
+
+
+    def at (self, row, column):
+        """
+            retrieves object at (row, column), if any;
+        """
+        # in grid bounds?
+        if self.is_inside(row, column):
+            return self.cells[row * self.columns + column]
+        # end if
+        return None
+    # end def
+
+
+    def destroy (self, obj):
+        """
+            removes @obj from grid and applies game rules;
+        """
+        # enabled?
+        if not obj.alive:
+            return
+        # end if
+        # remove from grid
+        obj.alive = False
+        self.cells[obj.row * self.columns + obj.column] = None
+        self._changed(obj.row, obj.column)
+        self.raise_event(obj, "Destroyed")
+        # inits
+        _name = obj.name
+        # score update
+        self.score += self.SCORES.get(_name, 0)
+        # counted object has been collected?
+        if "diamond" in obj.role:
+            self.diamonds_count -= 1
+            if self.diamonds_count < 1:
+                self.status = "won"
+                self.raise_event(None, "Stats:Level:Won")
+                return
+            # end if
+        # end if
+        # special cases
+        if _name == "Player":
+            self.status = "over"
+            self.raise_event(None, "Main:Game:Over")
+        elif _name == "GoldenKey":
+            for _obj in self.objects("Treasure"):
+                self.run_after(self.TREASURE_TICKS, self.unlock, _obj)
+            # end for
+        elif _name == "PUDiamond":
+            for _obj in self.objects("Trophy"):
+                _obj.counter -= 1
+                if _obj.counter <= 0:
+                    self.run_after(self.TROPHY_TICKS, self.unlock, _obj)
+                # end if
+            # end for
+        elif _name == "ZDiamond":
+            # remove only one zombie at a time
+            for _obj in self.objects("Zombie"):
+                if not _obj.state.startswith("die"):
+                    self.zombie_killed(_obj)
+                    break
+                # end if
+            # end for
+        elif _name == "SyncBarrier":
+            # role group synchronized destruction
+            for _obj in self.objects("SyncBarrier"):
+                if _obj.role == obj.role:
+                    self.destroy(_obj)
+                # end if
+            # end for
+        # end if
+    # end def
+
+
+    def get_location (self, obj):
+        """
+            game rules hook (see GameRules);
+            returns (row, column) location of @obj;
+        """
+        return (obj.row, obj.column)
+    # end def
+
+
+    def get_name (self, obj):
+        """
+            game rules hook (see GameRules);
+            returns @obj name e.g. 'RockDiamond';
+        """
+        return obj.name
+    # end def
+
+
+    def is_enabled (self, obj):
+        """
+            game rules hook (see GameRules);
+            determines if @obj is still alive;
+        """
+        return obj.alive
+    # end def
+
+
+    def is_falling_object (self, obj):
+        """
+            game rules hook (see GameRules);
+            determines if @obj is a falling object;
+        """
+        return obj.falling
+    # end def
+
+
+    def is_inside (self, row, column):
+        """
+            determines if (row, column) lies within grid bounds;
+        """
+        return 0 <= row < self.rows and 0 <= column < self.columns
+    # end def
+
+
+    def load_data (self, file_path):
+        """
+            loads data from game level JSON file;
+            see ObjectMapper.load_data();
+        """
+        # inits
+        _fpath = OP.abspath(OP.expanduser(file_path))
+        # data file *MUST* exist /!\
+        with open(_fpath) as file_in:
+            _data = json.load(file_in)
+        # end with
+        # reset members
+        self.reset()
+        self.level_name = _data.get("level_name") or ""
+        self.countdown = int(_data.get("countdown") or 600)
+        # def inits
+        _defs = dict()
+        _empty = " "
+        for key, defs in _data["defs"].items():
+            _role = str(defs["role"]).lower()
+            if "empty" in _role:
+                _empty = key
+            # end if
+            # TkBD{name}Sprite naming convention
+            _defs[key] = (str(defs.get("class") or "")[4:-6], _role)
+        # end for
+        # grid inits
+        _matrix = list(_data["matrix"])
+        self.rows = len(_matrix)
+        self.columns = max(0, 0, *map(len, _matrix))
+        self.cells = [None] * (self.rows * self.columns)
+        for _row, _rdata in enumerate(_matrix):
+            for _column, _cdata in enumerate(_rdata):
+                # trap over empty spaces
+                if _cdata == _empty:
+                    continue
+                # end if
+                # _cdata *MUST* be defined in defs /!\
+                _name, _role = _defs[_cdata]
+                _obj = GameObject(_name, _role, _row, _column)
+                self.cells[_row * self.columns + _column] = _obj
+                # special cases
+                if "diamond" in _role:
+                    self.diamonds_count += 1
+                # end if
+                if "player" in _role:
+                    self.player = _obj
+                elif _obj.falling:
+                    self.unstable.add(_obj)
+                # end if
+            # end for
+        # end for
+        # trophies count prize-unlocker diamonds
+        _count = len(self.objects("PUDiamond"))
+        for _obj in self.objects("Trophy"):
+            _obj.counter = _count
+        # end for
+        # start zombies AI
+        for _obj in self.objects("Zombie"):
+            self.run_after(
+                20 + self.random.randint(0, 10), self.zombie_ai, _obj
+            )
+        # end for
+        # start countdown
+        self.run_after(self.COUNTDOWN_TICKS, self.update_countdown)
+        self.status = "playing"
+    # end def
+
+
+    def move_object (self, obj, row, column):
+        """
+            moves @obj to (row, column) cell;
+        """
+        # inits
+        _cells = self.cells
+        _columns = self.columns
+        # free source cell
+        _cells[obj.row * _columns + obj.column] = None
+        self._changed(obj.row, obj.column)
+        # set destination cell
+        obj.row, obj.column = row, column
+        _cells[row * _columns + column] = obj
+        self._changed(row, column)
+    # end def
+
+
+    def move_player (self, sr, sc):
+        """
+            moves player along (sr, sc) relative step;
+            see TkBDPlayerSprite.filter_collisions();
+        """
+        # inits
+        _player = self.player
+        # player may move?
+        if not _player or _player.state in ("frozen", "splashed"):
+            return False
+        # end if
+        # walking states
+        if sc:
+            self.set_state(_player, "walk_left" if sc < 0 else "walk_right")
+            self.run_after(
+                self.PLAYER_IDLE_TICKS, self.set_state, _player, "default"
+            )
+        # end if
+        # look ahead
+        _row, _column = _player.row + sr, _player.column + sc
+        # off grid?
+        if not self.is_inside(_row, _column):
+            return False
+        # end if
+        _obj = self.at(_row, _column)
+        # got something?
+        if _obj:
+            # touched an enemy?
+            if "enemy" in _obj.role:
+                # player is dead!
+                self.player_frozen()
+                return False
+            # is overable?
+            elif _obj.is_overable:
+                # run over it!
+                self.destroy(_obj)
+                # level may be over
+                if self.status != "playing":
+                    return False
+                # end if
+            # is pushable?
+            elif not self.push(_obj, sr, sc):
+                # denied movement
+                return False
+            # end if
+        # end if
+        # move player
+        self.move_object(_player, _row, _column)
+        self.raise_event(_player, "Moved")
+        return True
+    # end def
+
+
+    def move_zombie (self, obj, sr, sc):
+        """
+            moves zombie along (sr, sc) relative step;
+            see TkBDZombieSprite.filter_collisions();
+        """
+        # look ahead
+        _row, _column = obj.row + sr, obj.column + sc
+        # off grid?
+        if not self.is_inside(_row, _column):
+            return False
+        # end if
+        _obj = self.at(_row, _column)
+        # got something?
+        if _obj:
+            # touched player?
+            if "player" in _obj.role:
+                # freeze!
+                self.player_frozen()
+                return False
+            # got some earth?
+            elif "earth" in _obj.role and _obj.is_overable:
+                # dig it!
+                self.destroy(_obj)
+            else:
+                # denied movement
+                return False
+            # end if
+        # end if
+        # move zombie
+        self.move_object(obj, _row, _column)
+        # zombie walks
+        if sc:
+            obj.direction = "left" if sc < 0 else "right"
+        # end if
+        self.set_state(obj, "walk_{}".format(obj.direction))
+        self.run_after(self.ZOMBIE_IDLE_TICKS, self.zombie_idle, obj)
+        return True
+    # end def
+
+
+    def notify_event (self, obj, action):
+        """
+            game rules hook (see GameRules);
+            records @action event for @obj;
+        """
+        self.raise_event(obj, action)
+    # end def
+
+
+    def objects (self, name=None):
+        """
+            returns list of alive objects in grid, filtered by
+            object @name, if any;
+        """
+        return [
+            _obj for _obj in self.cells
+            if _obj is not None and (name is None or _obj.name == name)
+        ]
+    # end def
+
+
+    def player_frozen (self):
+        """
+            player has been frozen by an enemy;
+        """
+        self.player_killed("frozen", "Frozen", self.PLAYER_FROZEN_TICKS)
+    # end def
+
+
+    def player_killed (self, state, action, ticks):
+        """
+            player is dying in @state, notifying @action and
+            disappearing after @ticks game steps;
+        """
+        # inits
+        _player = self.player
+        # enabled?
+        if _player and _player.alive:
+            self.timers_index.pop((self.set_state, id(_player)), None)
+            self.set_state(_player, state)
+            self.raise_event(_player, action)
+            self.run_after(ticks, self.destroy, _player)
+        # end if
+    # end def
+
+
+    def player_splashed (self):
+        """
+            player has been splashed;
+        """
+        self.player_killed(
+            "splashed", "Splashed", self.PLAYER_SPLASHED_TICKS
+        )
+    # end def
+
+
+    def pop_changes (self):
+        """
+            game rules hook (see GameRules);
+            returns cells changed since last call;
+            self.changes keeps all cells changed along current game
+            step;
+        """
+        _changes, self.new_changes = self.new_changes, set()
+        return _changes
+    # end def
+
+
+    def push (self, obj, sr, sc):
+        """
+            pushes @obj along (sr, sc) relative step, if possible;
+            see TkBDFallingSprite.has_moved();
+        """
+        # no vertical pushes admitted here
+        if sr or not obj.is_movable:
+            return False
+        # end if
+        # horizontal moves
+        if self.is_inside(obj.row, obj.column + sc) \
+                and self.at(obj.row, obj.column + sc) is None:
+            self.move_object(obj, obj.row, obj.column + sc)
+            self.raise_event(obj, "Pushed")
+            return True
+        # end if
+        return False
+    # end def
+
+
+    def raise_event (self, obj, action):
+        """
+            records event for current game step;
+            event names follow sprites naming convention i.e.
+            'Game:{name}:{action}' for objects, @action as is
+            otherwise;
+        """
+        # game object event?
+        if obj is not None:
+            action = "Game:{}:{}".format(obj.name, action)
+        # end if
+        self.events.append((action, obj))
+    # end def
+
+
+    def reset (self):
+        """
+            resets game engine to an empty grid;
+        """
+        # member inits
+        self.level_name = ""
+        self.rows = 0
+        self.columns = 0
+        self.cells = list()
+        self.player = None
+        self.countdown = 0
+        self.diamonds_count = 0
+        self.score = 0
+        self.tick = 0
+        self.status = "stopped"
+        self.unstable = set()
+        self.changes = set()
+        self.new_changes = set()
+        self.events = list()
+        self.timers = list()
+        self.timers_index = dict()
+        self.timers_sequence = 0
+    # end def
+
+
+    def run_after (self, ticks, callback, *args):
+        """
+            schedules @callback(*args) in @ticks game steps;
+            reschedules any pending call of the same callback for
+            the same first argument, if any;
+        """
+        # inits
+        self.timers_sequence += 1
+        _key = (callback, id(args[0]) if args else None)
+        _due = self.tick + max(1, int(ticks))
+        # replace previous call, if any
+        self.timers_index[_key] = self.timers_sequence
+        heapq.heappush(
+            self.timers,
+            (_due, self.timers_sequence, _key, callback, args)
+        )
+    # end def
+
+
+    def run_timers (self):
+        """
+            runs all timers due for current game step;
+        """
+        # inits
+        _timers = self.timers
+        # due timers
+        while _timers and _timers[0][0] <= self.tick:
+            _due, _sequence, _key, _callback, _args = \
+                heapq.heappop(_timers)
+            # still scheduled (not rescheduled nor cancelled)?
+            if self.timers_index.get(_key) == _sequence:
+                del self.timers_index[_key]
+                if self.status == "playing":
+                    _callback(*_args)
+                # end if
+            # end if
+        # end while
+    # end def
+
+
+    def set_state (self, obj, state):
+        """
+            sets @obj state, if still alive;
+        """
+        # enabled?
+        if obj.alive and obj.state != state:
+            obj.state = state
+            self._changed(obj.row, obj.column)
+            # changing magic rock
+            # (image sequence, see TkBDRockDiamondSprite)
+            if obj.name == "RockDiamond" and state == "change":
+                self.run_after(self.ROCKDIAMOND_TICKS, self.unlock, obj)
+            # end if
+        # end if
+    # end def
+
+
+    def splash_player (self, obj):
+        """
+            game rules hook (see GameRules);
+            player has been splashed;
+        """
+        self.player_splashed()
+    # end def
+
+
+    def step (self, input=None):
+        """
+            runs one game step with player @input, one of 'Up',
+            'Down', 'Left', 'Right' (same as keysyms) or None;
+            returns list of (event name, object) events raised
+            along this game step;
+            changed (row, column) cells are kept in self.changes
+            for renderers to follow;
+        """
+        # reset step data
+        self.events = list()
+        self.changes = set()
+        # game is running?
+        if self.status != "playing":
+            return self.events
+        # end if
+        # next step
+        self.tick += 1
+        # player moves
+        if input in self.INPUTS:
+            self.move_player(*self.INPUTS[input])
+        # end if
+        # scheduled tasks
+        self.run_timers()
+        # physics
+        if self.status == "playing":
+            self.update_falldown()
+        # end if
+        return self.events
+    # end def
+
+
+    def unlock (self, obj):
+        """
+            opens treasure or trophy, changes magic rock to diamond;
+        """
+        # enabled?
+        if not obj.alive:
+            return
+        # end if
+        # changing magic rock?
+        if obj.name == "RockDiamond":
+            self.set_state(obj, "diamond")
+            self.score += 100
+            _action = "Changed"
+        # treasure or trophy
+        else:
+            self.set_state(obj, "open")
+            if obj.name == "Trophy":
+                self.score += 1000
+            # end if
+            _action = "Opened"
+        # end if
+        obj.is_movable = False
+        obj.is_overable = True
+        self.raise_event(obj, _action)
+    # end def
+
+
+    def update_countdown (self):
+        """
+            updates game countdown;
+        """
+        # inits
+        self.countdown = max(0, self.countdown - 1)
+        # time is out!
+        if not self.countdown:
+            self.player_splashed()
+        # keep on counting down
+        else:
+            self.run_after(self.COUNTDOWN_TICKS, self.update_countdown)
+        # end if
+    # end def
+
+
+    def zombie_ai (self, obj):
+        """
+            zombie player tracking AI logics;
+            see TkBDZombieSprite.ai_loop();
+        """
+        # enabled?
+        if not obj.alive or obj.state.startswith("die"):
+            return
+        # end if
+        # inits
+        _player = self.player
+        dr, dc = (_player.row - obj.row, _player.column - obj.column)
+        # moving inits
+        _moved = False
+        # moving horizontally
+        if dc:
+            _moved = self.move_zombie(obj, 0, -1 if dc < 0 else +1)
+        # end if
+        # moving vertically
+        if dr and not _moved:
+            _moved = self.move_zombie(obj, -1 if dr < 0 else +1, 0)
+        # end if
+        # attack when close to player
+        if self.random.randint(1, 3) == 3 and not dr and abs(dc) < 4:
+            self.set_state(obj, "attack_{}".format(obj.direction))
+            self.raise_event(obj, "Attacking")
+        elif not _moved:
+            self.zombie_idle(obj)
+        # end if
+        # loop again
+        self.run_after(self.ZOMBIE_AI_TICKS, self.zombie_ai, obj)
+    # end def
+
+
+    def zombie_idle (self, obj):
+        """
+            zombie waits for events;
+        """
+        self.set_state(
+            obj, "default" if obj.direction == "right" else "idle_left"
+        )
+    # end def
+
+
+    def zombie_killed (self, obj):
+        """
+            zombie has been killed by some object;
+        """
+        # stop AI and pending states
+        self.timers_index.pop((self.zombie_ai, id(obj)), None)
+        self.timers_index.pop((self.zombie_idle, id(obj)), None)
+        # zombie dies now
+        self.set_state(obj, "die_{}".format(obj.direction))
+        self.raise_event(obj, "Dying")
+        self.score += 100
+        self.run_after(self.ZOMBIE_DIE_TICKS, self.destroy, obj)
+    # end def
+
+# end class GameEngine
@@ -33,6 +33,12 @@ from . import tkgame_audio as AU
 from . import tkgame_canvas as GC
 from . import tkgame_frame as GF
 from . import tkgame_i18n as i18n
+from . import tkgame_images as IM
+
+
+# debugging mode
+DEBUG = False
+#~ DEBUG = True
 
 
 # internationalization support (i18n)
@@ -49,6 +55,16 @@ __builtins__["FONT2"] = "{andrea karime}"
 __game_frame = None
 
 
+def tron (message, *args, **kw):
+    """
+        traces on messages for debugging session (TRON);
+    """
+    if DEBUG:
+        print("tkBoulderDash: {}".format(message), *args, **kw)
+    # end if
+# end def
+
+
 # app-wide unique instance getter
 def get_game (master=None, **kw):
     """
@@ -83,9 +99,11 @@ class TkBoulderDash (GF.TkGameFrame):
     FOOTER_COLOR = "indian red"
     FOOTER_COLOR2 = "gold"
 
-    GAME_MUSIC = "david-filskov-boulder-dash-trash-mix.wav"
+    GAME_MUSIC = "mp3/david-filskov-boulder-dash-trash-mix.mp3"
     GAME_MUSIC_VOLUME = 0.5
 
+    AUDIO_BACKEND_CACHE = "data/cache/audio_backend.json"
+
 
     def bind_tkevents (self):
         """
@@ -122,12 +140,18 @@ class TkBoulderDash (GF.TkGameFrame):
         # other inits
         self.cx, self.cy = self.canvas.center_xy()
         self.cw, self.ch = self.canvas.size()
+        # audio backend detection persists across runs
+        AU.BACKEND_CACHE = self.AUDIO_BACKEND_CACHE
         # gameplay inits
         self.game_play = GP.GamePlay(self.canvas, level=1)
         # database inits (may take a while)
         self.database = DB.get_database()
         # music inits
         self.music = AU.new_audio_player()
+        self.report_audio_backend()
+        # images warm-up phase inits
+        self.images_preloading = False
+        self.images_preload_stats = None
         # menu callback
         self.menu_callback = self.screen_main_menu
         # tk event inits
@@ -148,6 +172,7 @@ class TkBoulderDash (GF.TkGameFrame):
                 "Main:Music:Stop": self.stop_music,
                 "Stats:Level:Started": self.stats_level_started,
                 "Stats:Level:Won": self.stats_level_won,
+                "Stats:Images:Preloaded": self.stats_images_preloaded,
             }
         )
     # end def
@@ -203,6 +228,26 @@ class TkBoulderDash (GF.TkGameFrame):
     # end def
 
 
+    def preload_images (self, *args, **kw):
+        """
+            event handler;
+            images warm-up phase: decodes game levels' sprite
+            images in background, once for all;
+        """
+        # not already done?
+        if not self.images_preloading:
+            self.images_preloading = True
+            IM.get_image_manager().preload_images(
+                self.game_play.get_images_dirs(),
+                self,
+                callback=lambda **stats: self.events.raise_event(
+                    "Stats:Images:Preloaded", **stats
+                ),
+            )
+        # end if
+    # end def
+
+
     def quit_game (self, *args, **kw):
         """
             event handler;
@@ -296,6 +341,22 @@ class TkBoulderDash (GF.TkGameFrame):
     # end def
 
 
+    def report_audio_backend (self):
+        """
+            reports audio backend detection stats;
+        """
+        # inits
+        _stats = AU.get_backend_stats()
+        # report
+        if _stats:
+            AU.tron(
+                "audio backend: {backend} ({source}) "
+                "detected in {time:.1f} ms".format(**_stats)
+            )
+        # end if
+    # end def
+
+
     def run (self, *args, **kw):
         """
             event handler;
@@ -563,6 +624,8 @@ Have fun!""")
         self.start_music()
         # show game rules after a while
         self.animations.run_after(7000, self.screen_game_rules)
+        # images warm-up phase
+        self.preload_images()
     # end def
 
 
@@ -738,6 +801,29 @@ Have fun!""")
     # end def
 
 
+    def stats_images_preloaded (self, images, busy, total, **kw):
+        """
+            event handler;
+            reports images warm-up phase stats;
+        """
+        # keep stats
+        self.images_preload_stats = dict(
+            images=images, busy=busy, total=total
+        )
+        self.images_preload_stats.update(IM.get_image_manager().get_stats())
+        # report
+        tron(
+            "images warm-up: {} images decoded "
+            "in {:.0f} ms (busy {:.0f} ms)".format(images, total, busy)
+        )
+        tron(
+            "images cache: {entries} entries, "
+            "{unique} unique images, ~{bytes:,} bytes of pixels"
+            .format(**self.images_preload_stats)
+        )
+    # end def
+
+
     def stats_level_started (self, level, *args, **kw):
         """
             event handler;
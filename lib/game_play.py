@@ -26,14 +26,17 @@
 
 # lib imports
 import os.path as OP
+import time
 import tkinter.constants as TK
 from . import object_mapper as OM
 from . import tkgame_animations as AP
 from . import tkgame_audio as AU
+from . import tkgame_canvas_culling as CL
 from . import tkgame_canvas_fixedlayer as FL
 from . import tkgame_events as EM
 from . import tkgame_fx_flying_text as FXFT
 from . import tkgame_fx_rotating_sun as FXRS
+from . import tkgame_images as IM
 
 
 class GamePlay:
@@ -44,6 +47,23 @@ class GamePlay:
     # class constants
     TPL_LEVEL_FILE = "data/json/level_{}.json"
 
+    PHYSICS_TICK = 100      # game step in milliseconds
+
+    QUEUED_EVENTS = True    # drain deferred events once per game step
+
+    SOUND_RETRIGGER = 80    # min delay in ms between two same sounds
+
+    # deferred events whose handlers read sprite arguments
+    # (never coalesced, see __init__())
+    SPRITE_EVENTS = ("Game:RockDiamond:TouchedDown",)
+
+    SOUND_RETRIGGERS = {    # per-sound min delays in ms
+        "diamond-touched-down": 150,
+        "rock-touched-down": 150,
+        "treasure-touched-down": 150,
+        "trophy-touched-down": 150,
+    }
+
     SNDTRACK = {
         "alarm": 1,
         "player": 2,
@@ -67,13 +87,18 @@ class GamePlay:
         self.soundtracks = tuple(
             AU.new_audio_player() for i in range(len(self.SNDTRACK))
         )
+        self.sounds_pending = dict()
+        self.sounds_played = dict()
+        self.sound_stats = dict(played=0, merged=0, dropped=0)
         self.objects = OM.ObjectMapper(
             canvas, images_dir="images/sprites"
         )
         self.fixed_layer = FL.get_fixed_layer(canvas)
+        self.culling_layer = CL.get_culling_layer(canvas)
         self.mouse_down = False
         self.game_paused = False
         self.score = 0
+        self.score_displayed = 0
         self.high_score = 0
         # instance constant defs
         self.KEYMAP = {
@@ -113,7 +138,24 @@ class GamePlay:
             "Game:ZDiamond:TouchedDown": self.diamond_touched_down,
             "Game:Zombie:Attacking": self.zombie_attacking,
             "Game:Zombie:Dying": self.zombie_dying,
+            "Main:Game:Score:Changed": self.score_changed,
         }
+        # deferred events (see update_falldown())
+        # touchdown sounds and score display updates get merged
+        # when raised several times in one game step
+        # (only for handlers that do not read event arguments)
+        self.events.defer_events(
+            "Main:Game:Score:Changed",
+            *(
+                _signal for _signal in self.events_dict
+                if _signal.endswith(":TouchedDown")
+                and _signal not in self.SPRITE_EVENTS
+            ),
+            coalesce=True
+        )
+        # handlers reading sprite data keep each event apart
+        self.events.defer_events(*self.SPRITE_EVENTS)
+        self.events.set_queued(self.QUEUED_EVENTS)
 
         #~ self.level = 7 # debugging
 
@@ -169,8 +211,14 @@ class GamePlay:
         self.unbind_events()
         # stop any scheduled thread
         self.animations.clear_all()
+        # drop sounds waiting for cancelled flush_sounds()
+        self.sounds_pending = dict()
+        # drop deferred events
+        self.events.clear_queue()
         # clear canvas
         self.canvas.clear()
+        # canvas items are gone
+        self.culling_layer.clear()
     # end def
 
 
@@ -221,8 +269,14 @@ class GamePlay:
         self.clear_canvas()
         # try to set up current level
         try:
+            # inits
+            _fpath = self.get_level_fpath(self.level)
+            # keep level images in cache
+            IM.get_image_manager().pin_dirs(
+                self.objects.get_images_dirs(_fpath)
+            )
             # load level data
-            self.objects.load_data(self.get_level_fpath(self.level))
+            self.objects.load_data(_fpath)
         # got in trouble
         except Exception as e:
             #~ raise e from None
@@ -233,9 +287,12 @@ class GamePlay:
                 .format(e, self.level)
             )
         # end try
-        for _sprite in self.objects.matrix.objects():
-            _sprite.start()
-        # end for
+        # only sprites around viewport will get canvas items
+        self.culling_layer.reset(
+            self.objects.matrix, self.objects.player_sprite
+        )
+        self.objects.start_sprites()
+        self.culling_layer.update()
         # set player to foreground
         self.canvas.tag_raise(
             self.objects.player_sprite.canvas_id, TK.ALL
@@ -303,7 +360,9 @@ class GamePlay:
         self.animations.run_after(800, self.update_game_data)
         # notify stats unit
         self.events.raise_event(
-            "Stats:Level:Started", level=self.level
+            "Stats:Level:Started",
+            level=self.level,
+            load_timings=self.objects.load_timings,
         )
         # notify game has started
         self.events.raise_event(
@@ -325,6 +384,25 @@ class GamePlay:
     # end if
 
 
+    def flush_sounds (self, *args, **kw):
+        """
+            plays sounds requested since last call;
+            see self.play_sound();
+        """
+        # inits
+        _now = time.perf_counter()
+        _pending, self.sounds_pending = self.sounds_pending, dict()
+        # play sounds
+        for _name, (_track, _volume) in _pending.items():
+            self.sounds_played[_name] = _now
+            self.sound_stats["played"] += 1
+            self.soundtracks[_track].play(
+                "audio/{}.wav".format(_name), _volume
+            )
+        # end for
+    # end def
+
+
     def format_score (self, value=None):
         """
             score display formatting;
@@ -352,6 +430,28 @@ class GamePlay:
     # end def
 
 
+    def get_images_dirs (self):
+        """
+            returns list of sprites' images directories used by
+            game levels, from current level onwards;
+        """
+        # inits
+        _dirs = list()
+        _level = self.level
+        # browse level files
+        while OP.isfile(self.get_level_fpath(_level)):
+            for _dir in self.objects.get_images_dirs(
+                    self.get_level_fpath(_level)):
+                if _dir not in _dirs:
+                    _dirs.append(_dir)
+                # end if
+            # end for
+            _level += 1
+        # end while
+        return _dirs
+    # end def
+
+
     def get_level_fpath (self, level):
         """
             returns absolute path for a JSON level data file;
@@ -458,6 +558,8 @@ class GamePlay:
         """
         if self.mouse_down:
             self.canvas.scan_dragto(event.x, event.y)
+            # show sprites getting into view
+            self.culling_layer.update()
         # end if
     # end def
 
@@ -522,6 +624,10 @@ class GamePlay:
     def play_sound (self, sound_name, trackname=None, volume=0.5):
         """
             plays asynchronous sound;
+            same sound requests get merged until mainloop enters
+            idle mode and are dropped if the sound has been played
+            less than self.SOUND_RETRIGGER milliseconds ago (or
+            self.SOUND_RETRIGGERS[sound_name], if any);
         """
         # game options
         if not self.switch_off_sound:
@@ -529,10 +635,23 @@ class GamePlay:
             track = self.SNDTRACK.get(str(trackname).lower()) or 1
             track = max(1, min(track, len(self.soundtracks))) - 1
             sound_name = str(sound_name).replace(" ", "-")
-            # play sound
-            self.soundtracks[track].play(
-                "audio/{}.wav".format(sound_name), volume
+            _delay = self.SOUND_RETRIGGERS.get(
+                sound_name, self.SOUND_RETRIGGER
             )
+            _last = self.sounds_played.get(sound_name)
+            # played too recently?
+            if _last and (time.perf_counter() - _last) * 1000 < _delay:
+                self.sound_stats["dropped"] += 1
+                return
+            # already requested?
+            elif sound_name in self.sounds_pending:
+                self.sound_stats["merged"] += 1
+                track, _volume = self.sounds_pending[sound_name]
+                volume = max(volume, _volume)
+            # end if
+            self.sounds_pending[sound_name] = (track, volume)
+            # play sounds in idle mode
+            self.animations.run_after_idle(self.flush_sounds)
         # end if
     # end def
 
@@ -688,6 +807,7 @@ class GamePlay:
         """
         # reset score from here
         self.score = 0
+        self.score_displayed = 0
         # draw current level
         self.draw_level()
     # end def
@@ -699,16 +819,30 @@ class GamePlay:
         """
         # param inits
         value = abs(int(value))
+        # update score
+        self.score += value
         # score display animation
+        self.events.raise_event("Main:Game:Score:Changed")
+    # end def
+
+
+    def score_changed (self, *args, **kw):
+        """
+            event handler;
+            animates score display from currently displayed value
+            up to current score;
+        """
+        # inits
+        _start = self.score_displayed
+        # restart display animation
+        self.animations.stop(self.score_display_loop)
         self.animations.run_after(
             50,
             self.score_display_loop,
+            _start,
             self.score,
-            self.score + value,
-            value//15 or 1,
+            (self.score - _start)//15 or 1,
         )
-        # update score
-        self.score += value
     # end def
 
 
@@ -741,6 +875,8 @@ class GamePlay:
         self.canvas.yview_moveto((starty - cy)/mh)
         # update text items viewport fixed positions
         self.fixed_layer.update_positions()
+        # update sprites around viewport
+        self.culling_layer.update()
         # no more moves?
         if startx == stopx and starty == stopy:
             # trap out!
@@ -1018,12 +1154,16 @@ class GamePlay:
     def update_falldown (self, *args, **kw):
         """
             event handler;
-            updates falling down procedure;
-        """
-        for sprite in self.objects.falling_sprites:
-            sprite.fall_down()
-        # end for
-        self.animations.run_after(200, self.update_falldown)
+            central physics tick: updates falling down procedure
+            once per game step for unstable falling sprites only,
+            in classic Boulder Dash scan order (bottom row first);
+        """
+        self.objects.update_falldown()
+        # dispatch deferred events
+        self.events.drain_events()
+        # sprites may have moved into (or out of) viewport
+        self.culling_layer.update()
+        self.animations.run_after(self.PHYSICS_TICK, self.update_falldown)
     # end def
 
 
@@ -1043,7 +1183,12 @@ class GamePlay:
             event handler;
             updates diamond count display;
         """
+        # param inits
+        if value is None:
+            value = self.score
+        # end if
         # update display
+        self.score_displayed = value
         self.canvas.itemconfigure(
             self.cid_score, text=self.format_score(value)
         )
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    tkBoulderDash - Python3-Tkinter port of 'Boulder Dash' game
+
+    Python3-Tkinter port by Raphaël Seban <motus@laposte.net>
+
+    Copyright (c) 2014+ Raphaël Seban for the present code
+
+    This program is free software: you can redistribute it and/or
+    modify it under the terms of the GNU General Public License as
+    published by the Free Software Foundation, either version 3 of
+    the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+    General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.
+
+    If not, see http://www.gnu.org/licenses/
+"""
+
+# lib imports
+import heapq
+
+
+class GameRules:
+    """
+        Falling objects game rules, shared by Tkinter sprites
+        (see ObjectMapper) and headless game engine (see
+        GameEngine): physics step in classic Boulder Dash scan
+        order, falling down, rolling aside, splashing player and
+        touching down;
+        rules only deal with objects through hook methods, to be
+        reimplemented in subclass; objects must have 'role',
+        'state', 'is_falling', 'has_fallen' and 'need_looping'
+        attributes;
+    """
+
+    # class constants
+
+    # relative (row, column) locations of falling objects that may
+    # get unstable when a cell changes: the cell itself, the
+    # object above it and objects on both sides, whether on the same
+    # row or on the row above (see may_roll_over())
+    UNSTABLE_AROUND = (
+        (0, 0), (-1, 0), (0, -1), (0, +1), (-1, -1), (-1, +1),
+    )
+
+
+    def at (self, row, column):
+        """
+            hook method to be reimplemented in subclass;
+            retrieves object at (row, column), if any;
+        """
+        return None
+    # end def
+
+
+    def can_move_over (self, obj):
+        """
+            determines if a falling object may move over @obj;
+        """
+        return (obj is None) or ("background" in obj.role)
+    # end def
+
+
+    def destroy (self, obj):
+        """
+            hook method to be reimplemented in subclass;
+            removes @obj from grid and applies game rules;
+        """
+        pass
+    # end def
+
+
+    def fall_down (self, obj):
+        """
+            runs one single physics step for falling @obj;
+            this is called once per game step by update_falldown();
+            returns True if object has fallen, False otherwise;
+        """
+        # enabled?
+        if not self.is_enabled(obj):
+            return False
+        # end if
+        # inits
+        obj.need_looping = True
+        _fallen = False
+        _row, _column = self.get_location(obj)
+        _below = self.at(_row + 1, _column)
+        # nothing below?
+        if _below is None:
+            _fallen = self.is_inside(_row + 1, _column)
+        elif "player" in _below.role:
+            if obj.is_falling:
+                # splash the player!
+                self.splash_player(_below)
+                obj.is_falling = False
+            # end if
+        # background object?
+        elif "background" in _below.role:
+            # remove background object
+            self.destroy(_below)
+            _fallen = True
+        # need to roll aside?
+        elif self.is_falling_object(_below):
+            # depends on whatever is around
+            obj.need_looping = self.may_roll_over(obj)
+        else:
+            # no more falling down
+            obj.need_looping = False
+        # end if
+        # allowed movement
+        if _fallen:
+            obj.is_falling = True
+            self.move_object(obj, _row + 1, _column)
+        # end if
+        # no more moves?
+        if not obj.need_looping:
+            obj.is_falling = False
+            # object has fallen at previous step?
+            if obj.has_fallen:
+                self.touched_down(obj)
+            # end if
+        # end if
+        # keep track for next step
+        obj.has_fallen = _fallen
+        return _fallen
+    # end def
+
+
+    def get_location (self, obj):
+        """
+            hook method to be reimplemented in subclass;
+            returns (row, column) location of @obj;
+        """
+        return (0, 0)
+    # end def
+
+
+    def get_name (self, obj):
+        """
+            hook method to be reimplemented in subclass;
+            returns @obj name along sprites naming convention
+            i.e. TkBD{name}Sprite e.g. 'Rock', 'RockDiamond';
+        """
+        return ""
+    # end def
+
+
+    def get_unstable (self, changed_cells):
+        """
+            returns set of falling objects that may get unstable
+            along with @changed_cells (row, column) locations;
+        """
+        # inits
+        _objects = set()
+        _at = self.at
+        _falling = self.is_falling_object
+        # browse changed cells
+        for (_row, _column) in changed_cells:
+            # look around
+            for (_rr, _rc) in self.UNSTABLE_AROUND:
+                _obj = _at(_row + _rr, _column + _rc)
+                if _obj is not None and _falling(_obj):
+                    _objects.add(_obj)
+                # end if
+            # end for
+        # end for
+        return _objects
+    # end def
+
+
+    def is_enabled (self, obj):
+        """
+            hook method to be reimplemented in subclass;
+            determines if @obj still plays (not destroyed);
+        """
+        return True
+    # end def
+
+
+    def is_falling_object (self, obj):
+        """
+            hook method to be reimplemented in subclass;
+            determines if @obj is subject to falling rules;
+        """
+        return False
+    # end def
+
+
+    def is_inside (self, row, column):
+        """
+            hook method to be reimplemented in subclass;
+            determines if (row, column) lies within grid bounds;
+        """
+        return False
+    # end def
+
+
+    def may_roll_over (self, obj):
+        """
+            determines if @obj may roll aside over one another;
+        """
+        # enabled?
+        if not self.is_enabled(obj):
+            return False
+        # end if
+        # inits
+        _row, _column = self.get_location(obj)
+        # loop on directions (left/right)
+        for sx in (-1, +1):
+            # off grid?
+            if not self.is_inside(_row + 1, _column + sx):
+                continue
+            # end if
+            _o1 = self.at(_row, _column + sx)
+            _o2 = self.at(_row + 1, _column + sx)
+            # may roll over?
+            if self.can_move_over(_o1) and self.can_move_over(_o2):
+                # free some space
+                if _o1: self.destroy(_o1)
+                if _o2: self.destroy(_o2)
+                # move object
+                if self.at(_row, _column + sx) is None:
+                    self.move_object(obj, _row, _column + sx)
+                # end if
+                # keep on falling
+                return True
+            # end if
+        # end for
+        # stop falling
+        return False
+    # end def
+
+
+    def move_object (self, obj, row, column):
+        """
+            hook method to be reimplemented in subclass;
+            moves @obj to (row, column) free cell;
+        """
+        pass
+    # end def
+
+
+    def notify_event (self, obj, action):
+        """
+            hook method to be reimplemented in subclass;
+            notifies @action for @obj e.g. 'TouchedDown';
+        """
+        pass
+    # end def
+
+
+    def pop_changes (self):
+        """
+            hook method to be reimplemented in subclass;
+            returns set of (row, column) cells changed since last
+            call;
+        """
+        return set()
+    # end def
+
+
+    def set_state (self, obj, state):
+        """
+            hook method to be reimplemented in subclass;
+            sets @obj state;
+        """
+        pass
+    # end def
+
+
+    def splash_player (self, obj):
+        """
+            hook method to be reimplemented in subclass;
+            player @obj has been splashed by a falling object;
+        """
+        pass
+    # end def
+
+
+    def touched_down (self, obj):
+        """
+            falling @obj has touched down;
+            magic rocks change to diamonds when falling down on a
+            rock-like object (see TkBDRockDiamondSprite);
+        """
+        # magic rock still a rock?
+        if self.get_name(obj) == "RockDiamond" and obj.state == "default":
+            # who's below?
+            _row, _column = self.get_location(obj)
+            _below = self.at(_row + 1, _column)
+            # falling down on a rock-like object?
+            if _below and "rock" in _below.role:
+                self.set_state(obj, "change")
+                self.notify_event(obj, "Changing")
+                return
+            # end if
+        # end if
+        # notify gameplay
+        self.notify_event(obj, "TouchedDown")
+    # end def
+
+
+    def update_falldown (self):
+        """
+            runs one physics step on unstable falling objects only,
+            in classic Boulder Dash scan order i.e. bottom row first,
+            then from left to right;
+            objects getting unstable during the scan are evaluated
+            in the same step when they come later in scan order,
+            otherwise they wait for the next step (see self.unstable);
+            returns number of evaluated objects;
+        """
+        # inits
+        _heap = list()
+        _done = set()
+        _sequence = 0
+        _objects = self.unstable
+        _objects.update(self.get_unstable(self.pop_changes()))
+        self.unstable = set()
+        # sort along with (row, column) location
+        for _obj in _objects:
+            _row, _column = self.get_location(_obj)
+            _heap.append((-_row, _column, _sequence, _obj))
+            _sequence += 1
+        # end for
+        heapq.heapify(_heap)
+        # scan loop
+        while _heap:
+            _key = heapq.heappop(_heap)
+            _obj = _key[3]
+            # evaluate once per step
+            if _obj in _done:
+                continue
+            # end if
+            _done.add(_obj)
+            self.fall_down(_obj)
+            # what has changed?
+            for _other in self.get_unstable(self.pop_changes()):
+                _row, _column = self.get_location(_other)
+                # coming later in scan order?
+                if _other not in _done and (-_row, _column) > _key[:2]:
+                    heapq.heappush(
+                        _heap, (-_row, _column, _sequence, _other)
+                    )
+                    _sequence += 1
+                # wait for the next step
+                else:
+                    self.unstable.add(_other)
+                # end if
+            # end for
+        # end while
+        return len(_done)
+    # end def
+
+# end class GameRules
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""
+    tkBoulderDash - Python3-Tkinter port of 'Boulder Dash' game
+
+    Python3-Tkinter port by Raphaël Seban <motus@laposte.net>
+
+    Copyright (c) 2014+ Raphaël Seban for the present code
+
+    This program is free software: you can redistribute it and/or
+    modify it under the terms of the GNU General Public License as
+    published by the Free Software Foundation, either version 3 of
+    the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+    General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.
+
+    If not, see http://www.gnu.org/licenses/
+"""
+
+# lib imports
+import hashlib
+import json
+import os
+import os.path as OP
+import struct
+
+
+# compiled level file format
+#
+# header: magic, JSON source (mtime_ns, size, sha1), rows, columns,
+# byte length of UTF-8 JSON metadata (level name, countdown, defs
+# and cell codes table); header is followed by metadata and then
+# by a rows * columns grid of one-byte cell codes, each code being
+# an index in cell codes table;
+MAGIC = b"TKBDLV\x00\x01"
+HEADER = struct.Struct("<8sqq20sIII")
+
+# compiled files suffix
+SUFFIX = ".lvl"
+
+# validity checks: "mtime" (mtime + size) or "hash" (sha1 content)
+CHECK = "mtime"
+
+
+class CompiledLevel:
+    """
+        Game level data loaded from a compiled level file;
+    """
+
+    def __init__ (self, meta, rows_data):
+        """
+            class constructor;
+        """
+        # member inits
+        self.level_name = meta.get("level_name") or ""
+        self.countdown = meta.get("countdown")
+        self.defs = meta["defs"]
+        self.keys = meta["keys"]
+        self.rows_data = rows_data
+    # end def
+
+
+    def get_code (self, key, default=-1):
+        """
+            returns cell code for @key defs char or @default if
+            @key is not used in grid;
+        """
+        # inits
+        try:
+            return self.keys.index(key)
+        except ValueError:
+            return default
+        # end try
+    # end def
+
+# end class CompiledLevel
+
+
+def get_cache_path (file_path, cache_dir=None):
+    """
+        returns compiled file path for @file_path JSON level file;
+        compiled file is located in @cache_dir, if any, or next to
+        the JSON file otherwise;
+    """
+    # inits
+    _dir, _name = OP.split(OP.abspath(OP.expanduser(file_path)))
+    _name = OP.splitext(_name)[0] + SUFFIX
+    if cache_dir:
+        _dir = OP.abspath(OP.expanduser(cache_dir))
+    # end if
+    return OP.join(_dir, _name)
+# end def
+
+
+def compile_level (file_path, cache_path):
+    """
+        compiles @file_path JSON level file to @cache_path binary
+        file; returns compiled level data;
+        levels using more than 256 distinct cell keys do not fit
+        in one-byte codes and are never written to cache;
+    """
+    # inits
+    with open(file_path, "rb") as file_in:
+        _source = file_in.read()
+    # end with
+    _stat = os.stat(file_path)
+    _data = json.loads(_source.decode("utf-8"))
+    _matrix = _data["matrix"]
+    _defs = _data["defs"]
+    # empty cell key
+    _empty = " "
+    for _key, _def in _defs.items():
+        if "empty" in str(_def.get("role")).lower():
+            _empty = _key
+        # end if
+    # end for
+    # cell codes table (empty cell first)
+    _keys = [_empty]
+    _codes = {_empty: 0}
+    for _rdata in _matrix:
+        for _cdata in _rdata:
+            if _cdata not in _codes:
+                _codes[_cdata] = len(_keys)
+                _keys.append(_cdata)
+            # end if
+        # end for
+    # end for
+    _meta = {
+        "level_name": _data.get("level_name"),
+        "countdown": _data.get("countdown"),
+        "defs": _defs,
+        "keys": _keys,
+    }
+    # not fitting in one-byte codes?
+    if len(_keys) > 256:
+        return CompiledLevel(
+            _meta,
+            [[_codes[_cdata] for _cdata in _rdata] for _rdata in _matrix]
+        )
+    # end if
+    # grid of cell codes (short rows are padded with empty cells)
+    _rows = len(_matrix)
+    _columns = max(0, 0, *map(len, _matrix))
+    _grid = bytearray(_rows * _columns)
+    for _row, _rdata in enumerate(_matrix):
+        _grid[_row * _columns:_row * _columns + len(_rdata)] = bytes(
+            _codes[_cdata] for _cdata in _rdata
+        )
+    # end for
+    _meta_bytes = json.dumps(_meta).encode("utf-8")
+    # write compiled file (cache is optional)
+    try:
+        os.makedirs(OP.dirname(cache_path), exist_ok=True)
+        _tmp_path = cache_path + ".tmp"
+        with open(_tmp_path, "wb") as file_out:
+            file_out.write(
+                HEADER.pack(
+                    MAGIC, _stat.st_mtime_ns, _stat.st_size,
+                    hashlib.sha1(_source).digest(),
+                    _rows, _columns, len(_meta_bytes)
+                )
+            )
+            file_out.write(_meta_bytes)
+            file_out.write(_grid)
+        # end with
+        os.replace(_tmp_path, cache_path)
+    except OSError:
+        pass
+    # end try
+    return CompiledLevel(
+        _meta,
+        [
+            bytes(_grid[_row * _columns:(_row + 1) * _columns])
+            for _row in range(_rows)
+        ]
+    )
+# end def
+
+
+def is_valid (header, file_path, check=None):
+    """
+        determines if compiled file unpacked @header is still valid
+        for @file_path JSON level file along with @check mode;
+    """
+    # inits
+    _magic, _mtime, _size, _sha1 = header[:4]
+    _stat = os.stat(file_path)
+    # same format?
+    if _magic != MAGIC or _size != _stat.st_size:
+        return False
+    # end if
+    # content hash
+    if (check or CHECK) == "hash":
+        with open(file_path, "rb") as file_in:
+            return hashlib.sha1(file_in.read()).digest() == _sha1
+        # end with
+    # end if
+    # modification time
+    return _mtime == _stat.st_mtime_ns
+# end def
+
+
+def load_compiled (file_path, cache_path, check=None):
+    """
+        loads @cache_path compiled level file if still valid for
+        @file_path JSON level file; returns None otherwise;
+    """
+    # inits
+    try:
+        with open(cache_path, "rb") as file_in:
+            _buffer = file_in.read()
+        # end with
+    except OSError:
+        return None
+    # end try
+    try:
+        _header = HEADER.unpack_from(_buffer)
+        if not is_valid(_header, file_path, check):
+            return None
+        # end if
+        _rows, _columns, _meta_size = _header[4:]
+        _start = HEADER.size + _meta_size
+        if len(_buffer) < _start + _rows * _columns:
+            return None
+        # end if
+        _meta = json.loads(_buffer[HEADER.size:_start].decode("utf-8"))
+        return CompiledLevel(
+            _meta,
+            [
+                _buffer[_offset:_offset + _columns]
+                for _offset in range(
+                    _start, _start + _rows * _columns, _columns
+                )
+            ]
+        )
+    except (struct.error, ValueError, KeyError):
+        return None
+    # end try
+# end def
+
+
+def load_level (file_path, cache_dir=None, check=None):
+    """
+        returns compiled level data for @file_path JSON level file;
+        compiled file is looked up in @cache_dir (or next to the
+        JSON file) and gets (re)built when missing or outdated;
+        see CHECK for @check mode;
+    """
+    # inits
+    file_path = OP.abspath(OP.expanduser(file_path))
+    _cache_path = get_cache_path(file_path, cache_dir)
+    # compiled file is up to date?
+    _level = load_compiled(file_path, _cache_path, check)
+    if _level is None:
+        _level = compile_level(file_path, _cache_path)
+    # end if
+    return _level
+# end def
@@ -27,57 +27,122 @@
 
 # lib imports
 import os.path as OP
-import json
+import importlib
+import time
+from . import game_rules as GR
+from . import level_cache as LC
 from . import tkgame_events as EM
 from . import tkgame_matrix as MX
 
 
-class ObjectMapper:
+# debugging mode
+DEBUG = False
+#~ DEBUG = True
+
+
+# module private member
+__sprite_classes = dict()
+
+
+def tron (message, *args, **kw):
+    """
+        traces on messages for debugging session (TRON);
+    """
+    if DEBUG:
+        print("ObjectMapper: {}".format(message), *args, **kw)
+    # end if
+# end def
+
+
+def get_sprite_class (module, class_name):
+    """
+        sprite class registry;
+        resolves @class_name class from lib's @module module once
+        for all and keeps it in cache for further level loadings;
+    """
+    # inits
+    _key = (module, class_name)
+    _class = __sprite_classes.get(_key)
+    # not already resolved?
+    if _class is None:
+        _module = importlib.import_module(
+            ".{}".format(module), __package__
+        )
+        _class = __sprite_classes[_key] = getattr(_module, class_name)
+    # end if
+    return _class
+# end def
+
+
+class ObjectMapper (GR.GameRules):
     """
         Game level objects mapper;
+        falling sprites physics follow game rules (see GameRules),
+        mapped onto sprites through hook methods;
     """
 
     # class constants
     CELLSIZE = 64       # in pixels
 
+    MATRIX_ENGINE = "dict"      # see tkgame_matrix.ENGINES
+
+    LEVEL_CACHE_DIR = "data/cache"      # compiled level files
 
-    def __init__ (self, canvas, images_dir=None):
+
+    def __init__ (self, canvas, images_dir=None, matrix_engine=None):
         """
-            class constructor
+            class constructor;
+            parameter @matrix_engine selects game matrix cell
+            storage engine ('dict' or 'array'); defaults to
+            self.MATRIX_ENGINE if omitted;
         """
         self.canvas = canvas
         self.images_dir = images_dir
         self.events = EM.get_event_manager()
-        self.matrix = MX.TkGameMatrix(cellsize=self.CELLSIZE)
+        self.matrix = MX.new_matrix(
+            matrix_engine or self.MATRIX_ENGINE,
+            cellsize=self.CELLSIZE,
+        )
         self.player_sprite = None
         self.falling_sprites = None
+        self.unstable = set()
         self.countdown = 0
         self.diamonds_count = 0
         self.level_name = ""
+        self.load_timings = dict()
     # end def
 
 
     def load_data (self, file_path):
         """
             loads data from game level JSON file;
+            level data is read from its compiled binary file in
+            self.LEVEL_CACHE_DIR, which gets (re)built on the fly
+            when missing or outdated (see level_cache module);
+            load times (in ms) are kept in self.load_timings along
+            with 'parse', 'classes' and 'sprites' stages;
         """
         # inits
         _fpath = OP.abspath(OP.expanduser(file_path))
+        _timer = time.perf_counter()
+        self.load_timings = dict()
         # data file *MUST* exist /!\
-        with open(_fpath) as file_in:
-            _data = json.load(file_in)
-        # end with
+        _level = LC.load_level(_fpath, self.LEVEL_CACHE_DIR)
+        _timer = self.update_timings("parse", _timer)
         # reset members
-        self.level_name = _data.get("level_name") or ""
-        self.countdown = int(_data.get("countdown") or 600)
+        self.level_name = _level.level_name
+        self.countdown = int(_level.countdown or 600)
         self.diamonds_count = 0
         self.falling_sprites = list()
+        self.unstable = set()
         # default values
         _empty = " "
         _player = "P"
         _diamonds = set()
         # def inits
-        _defs = _data["defs"]
+        _defs = _level.defs
+        _keys = _level.keys
+        _factories = dict()
         # rebuild data
         for key, defs in _defs.items():
             # update role (mandatory)
@@ -92,9 +157,11 @@ class ObjectMapper:
                 # empty space in matrix
                 _empty = key
             # end if
-            # lib imports (optional)
+            # sprite class (optional)
             if defs.get("module"):
-                exec("from . import {module}".format(**defs))
+                _factories[key] = get_sprite_class(
+                    defs["module"], defs["class"]
+                )
             # end if
             # update images dir (optional)
             if defs.get("images_dir"):
@@ -103,29 +170,29 @@ class ObjectMapper:
                 )
             # end if
         # end for
+        _timer = self.update_timings("classes", _timer)
         # init game matrix
-        self.matrix.resize(_data["matrix"])
+        self.matrix.resize(_level.rows_data)
         self.matrix.defs = _defs
-        for _row, _rdata in enumerate(_data["matrix"]):
-            for _column, _cdata in enumerate(_rdata):
+        _empty = _level.get_code(_empty)
+        for _row, _rdata in enumerate(_level.rows_data):
+            for _column, _code in enumerate(_rdata):
                 # trap over empty spaces
-                if _cdata == _empty:
+                if _code == _empty:
                     continue
                 # end if
+                _cdata = _keys[_code]
                 # _cdata *MUST* be defined in defs /!\
                 _attrs = _defs[_cdata]
                 # create sprite
-                _sprite = eval(
-                    "{module}.{class}(self, self.matrix, self.canvas)"
-                    .format(**_attrs)
-                )
+                _sprite = _factories[_cdata](self, self.matrix, self.canvas)
                 _sprite.role = _attrs["role"]
                 _sprite.images_dir = _attrs["images_dir"]
                 _sprite.row_column = (_row, _column)
                 # put sprite into game matrix
                 self.matrix.set_at((_row, _column), _sprite)
                 # feed falling sprites list
-                if hasattr(_sprite, "fall_down"):
+                if self.is_falling_object(_sprite):
                     self.falling_sprites.append(_sprite)
                 # end if
                 # special cases
@@ -136,6 +203,185 @@ class ObjectMapper:
                 # end if
             # end for
         # end for
+        # all falling sprites must be evaluated at least once
+        self.unstable.update(self.falling_sprites)
+        # track further matrix changes from now on
+        self.matrix.track_changes()
+        self.update_timings("sprites", _timer)
+    # end def
+
+
+    def start_sprites (self):
+        """
+            starts all sprites in game matrix;
+            start time (in ms) is kept in self.load_timings along
+            with 'start' stage;
+        """
+        # inits
+        _timer = time.perf_counter()
+        # browse sprites
+        for _sprite in self.matrix.objects():
+            _sprite.start()
+        # end for
+        self.update_timings("start", _timer)
+        tron(
+            "load timings (ms):",
+            ", ".join(
+                "{}={:.1f}".format(*_item)
+                for _item in self.load_timings.items()
+            )
+        )
+    # end def
+
+
+    def update_timings (self, stage, timer):
+        """
+            sets elapsed time (in ms) since @timer perf counter value
+            for @stage in self.load_timings;
+            returns new timer value for next stage;
+        """
+        # inits
+        _now = time.perf_counter()
+        self.load_timings[stage] = (_now - timer) * 1000
+        return _now
+    # end def
+
+
+    def get_images_dirs (self, file_path):
+        """
+            returns list of sprites' images directories used by
+            @file_path game level file, without loading level;
+        """
+        # inits
+        _level = LC.load_level(file_path, self.LEVEL_CACHE_DIR)
+        _dirs = list()
+        # browse defs
+        for _defs in _level.defs.values():
+            if _defs.get("images_dir"):
+                _dir = OP.abspath(
+                    OP.join(self.images_dir, _defs["images_dir"])
+                )
+                if _dir not in _dirs:
+                    _dirs.append(_dir)
+                # end if
+            # end if
+        # end for
+        return _dirs
+    # end def
+
+
+    def at (self, row, column):
+        """
+            game rules hook (see GameRules);
+            retrieves sprite at (row, column), if any;
+        """
+        return self.matrix.at((row, column))
+    # end def
+
+
+    def destroy (self, sprite):
+        """
+            game rules hook (see GameRules);
+            destroys @sprite;
+        """
+        sprite.destroy()
+    # end def
+
+
+    def get_location (self, sprite):
+        """
+            game rules hook (see GameRules);
+            returns (row, column) location of @sprite;
+        """
+        return sprite.row_column
+    # end def
+
+
+    def get_name (self, sprite):
+        """
+            game rules hook (see GameRules);
+            returns @sprite name e.g. 'RockDiamond';
+        """
+        return sprite.sprite_name
+    # end def
+
+
+    def is_enabled (self, sprite):
+        """
+            game rules hook (see GameRules);
+            determines if @sprite has not been destroyed;
+        """
+        return not sprite.locked
+    # end def
+
+
+    def is_falling_object (self, sprite):
+        """
+            game rules hook (see GameRules);
+            determines if @sprite is a falling sprite;
+        """
+        return hasattr(sprite, "fall_down")
+    # end def
+
+
+    def is_inside (self, row, column):
+        """
+            game rules hook (see GameRules);
+            determines if (row, column) lies within matrix bounds;
+        """
+        return (
+            0 <= row < self.matrix.rows and 0 <= column < self.matrix.columns
+        )
+    # end def
+
+
+    def move_object (self, sprite, row, column):
+        """
+            game rules hook (see GameRules);
+            moves @sprite to (row, column) free cell;
+        """
+        # inits
+        _row, _column = sprite.row_column
+        # relative move
+        sprite.move_sprite(
+            column - _column, row - _row, callback=lambda c_dict: True
+        )
+    # end def
+
+
+    def notify_event (self, sprite, action):
+        """
+            game rules hook (see GameRules);
+            notifies @action for @sprite;
+        """
+        sprite.notify_event(action)
+    # end def
+
+
+    def pop_changes (self):
+        """
+            game rules hook (see GameRules);
+            returns matrix cells changed since last call;
+        """
+        return self.matrix.pop_changes()
+    # end def
+
+
+    def set_state (self, sprite, state):
+        """
+            game rules hook (see GameRules);
+            sets @sprite state;
+        """
+        sprite.state = state
+    # end def
+
+
+    def splash_player (self, sprite):
+        """
+            game rules hook (see GameRules);
+            player @sprite has been splashed;
+        """
+        sprite.splashed()
     # end def
 
 
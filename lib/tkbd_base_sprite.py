@@ -39,8 +39,10 @@ class TkBDBaseSprite (S.TkGameMatrixSprite):
             event handler;
             hook method to be reimplemented in subclass;
             class event bindings;
+            slots are weakly referenced: collected sprites get
+            automatically disconnected;
         """
-        self.events.connect_dict(self.events_dict)
+        self.events.connect_dict(self.events_dict, weak=True)
     # end def
 
 
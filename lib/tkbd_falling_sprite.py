@@ -31,17 +31,9 @@ from . import tkbd_base_sprite as S
 class TkBDFallingSprite (S.TkBDBaseSprite):
     """
         Generic falling sprite in the mine;
+        sprite's owner must be an ObjectMapper (see GameRules);
     """
 
-    def can_move_over (self, sprite):
-        """
-            hook method to be reimplemented in subclass;
-            determines if current sprite may move over @sprite;
-        """
-        return (not sprite) or ("background" in sprite.role)
-    # end def
-
-
     def destroy (self, *args, **kw):
         """
             event handler for sprite destruction;
@@ -49,8 +41,8 @@ class TkBDFallingSprite (S.TkBDBaseSprite):
         """
         # enabled?
         if not self.locked:
-            # stop animations
-            self.animations.lock(self.falling_loop)
+            # no more falling
+            self.need_looping = False
             # super class inits
             super().destroy(*args, **kw)
         # end if
@@ -60,81 +52,13 @@ class TkBDFallingSprite (S.TkBDBaseSprite):
     def fall_down (self):
         """
             sprite has been asked to fall down;
+            runs one single physics step: this is called once per
+            game step by gameplay's central physics tick;
+            falling rules are shared with headless game engine
+            (see GameRules.fall_down());
+            returns True if sprite has fallen, False otherwise;
         """
-        # enabled?
-        if not (self.locked or self.need_looping):
-            # lock sprite for further operations
-            self.need_looping = True
-            # ok, let's go!
-            self.animations.run_after(100, self.falling_loop)
-        # end if
-    # end def
-
-
-    def falling_collisions (self, c_dict):
-        """
-            allows or denies movement along with collision tests;
-        """
-        # security
-        if self.locked:
-            return False
-        # end if
-        # inits
-        self.need_looping = True
-        # param inits
-        sprite = c_dict["sprite"]
-        if sprite:
-            if "player" in sprite.role:
-                if self.is_falling:
-                    # splash the player!
-                    sprite.splashed()
-                    self.is_falling = False
-                # end if
-            # background sprite?
-            elif "background" in sprite.role:
-                # remove background sprite
-                sprite.destroy()
-                # now falling down
-                self.is_falling = True
-                # allowed movement
-                return True
-            # need to roll aside?
-            elif isinstance(sprite, __class__):
-                # depends on whatever is around
-                self.need_looping = self.may_roll_over()
-            else:
-                # no more falling down
-                self.need_looping = False
-            # end if
-            # denied movement
-            return False
-        # end if
-        # now falling down
-        self.is_falling = True
-        # allowed movement
-        return True
-    # end def
-
-
-    def falling_loop (self, has_fallen=False):
-        """
-            sprite falling down animation loop;
-        """
-        # security
-        if self.locked:
-            return False
-        # end if
-        # evaluate falldown
-        _fallen = self.move_sprite(0, +1, callback=self.falling_collisions)
-        if self.need_looping:
-            self.animations.run_after(100, self.falling_loop, _fallen)
-        else:
-            self.animations.stop(self.falling_loop)
-            self.is_falling = False
-            if has_fallen:
-                self.touched_down()
-            # end if
-        # end if
+        return self.owner.fall_down(self)
     # end def
 
 
@@ -168,47 +92,8 @@ class TkBDFallingSprite (S.TkBDBaseSprite):
         super().init_sprite(**kw)
         # member inits
         self.is_falling = False
+        self.has_fallen = False
         self.need_looping = False
     # end def
 
-
-    def may_roll_over (self):
-        """
-            determines if sprite may roll aside over one another;
-        """
-        # security
-        if self.locked:
-            return False
-        # end if
-        # loop on directions (left/right)
-        for sx in (-1, +1):
-            _s1 = self.look_ahead(sx, 0)["sprite"]
-            _s2 = self.look_ahead(sx, +1)["sprite"]
-            _roll = bool(
-                self.can_move_over(_s1) and self.can_move_over(_s2)
-            )
-            # may roll over?
-            if _roll:
-                # free some space
-                if _s1: _s1.destroy()
-                if _s2: _s2.destroy()
-                # move sprite
-                self.move_sprite(sx, 0, lambda c: not c["sprite" ])
-                # keep on falling
-                return True
-            # end if
-        # end for
-        # stop falling
-        return False
-    # end def
-
-
-    def touched_down (self):
-        """
-            hook method to be implemented by subclass;
-        """
-        # notify gameplay
-        self.notify_event("TouchedDown")
-    # end def
-
 # end class TkBDFallingSprite
@@ -79,25 +79,4 @@ class TkBDRockDiamondSprite (S.TkBDFallingSprite):
         self.notify_event("Changed")
     # end def
 
-
-    def touched_down (self):
-        """
-            hook method to be implemented by subclasses;
-        """
-        # current sprite is still a rock?
-        if self.state == "default":
-            # who's below?
-            sprite = self.look_ahead(0, +1)["sprite"]
-            # current sprite may change only when falling down
-            # on a rock-like sprite!
-            if "rock" in sprite.role:
-                self.state = "change"
-                self.notify_event("Changing")
-                return
-            # end if
-        # end if
-        # notify gameplay
-        self.notify_event("TouchedDown")
-    # end def
-
 # end class TkBDRockDiamondSprite
@@ -40,7 +40,7 @@ class TkBDSyncBarrierSprite (S.TkBDBaseSprite):
         """
         # bind events
         self.events.connect(
-            self.get_event_name("Destroyed"), self.destroy
+            self.get_event_name("Destroyed"), self.destroy, weak=True
         )
     # end def
 
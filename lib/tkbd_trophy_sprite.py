@@ -73,8 +73,10 @@ class TkBDTrophySprite (S.TkBDFallingSprite):
             game has started;
         """
         def deferred ():
-            # raise sprite to foreground
-            self.canvas.tag_raise(self.canvas_id, "all")
+            # raise sprite to foreground (unless culled)
+            if self.canvas_id:
+                self.canvas.tag_raise(self.canvas_id, "all")
+            # end if
         # end def
         # deferred action
         self.animations.run_after(2000, deferred)
@@ -23,9 +23,18 @@
 """
 
 # lib imports
+import heapq
+import time
 import tkinter as TK
 
 
+# animation pool mode:
+# set to True to multiplex all animations onto one single
+# recurring tkinter after() callback (see TkGameTimerWheelPool)
+TIMER_WHEEL = False
+#~ TIMER_WHEEL = True
+
+
 # private module member
 __animation_pool = None
 
@@ -37,7 +46,11 @@ def get_animation_pool ():
     """
     global __animation_pool
     if not isinstance(__animation_pool, TkGameAnimationPool):
-        __animation_pool = TkGameAnimationPool()
+        if TIMER_WHEEL:
+            __animation_pool = TkGameTimerWheelPool()
+        else:
+            __animation_pool = TkGameAnimationPool()
+        # end if
     # end if
     return __animation_pool
 # end def
@@ -58,6 +71,11 @@ class TkGameAnimationPool:
         self.lockers = dict()
         # tkinter default root object
         self.root = TK._default_root
+        # profiling inits (disabled by default)
+        self.profiling = False
+        self.profile = dict()
+        self.profile_due = dict()
+        self.profile_dump_id = None
     # end def
 
 
@@ -73,10 +91,74 @@ class TkGameAnimationPool:
             # set atomic mode
             self.lockers[callback] = True
             # run callback
-            callback(*args)
-            # release atomic mode
-            self.lockers[callback] = False
+            try:
+                if self.profiling:
+                    self._profile_run(callback, *args)
+                else:
+                    callback(*args)
+                # end if
+            finally:
+                # release atomic mode
+                self.lockers[callback] = False
+            # end try
+        # end if
+    # end def
+
+
+    def _profile_entry (self, callback):
+        """
+            protected method - returns profiling stats dict() for
+            @callback qualified name;
+        """
+        # inits
+        _name = getattr(callback, "__qualname__", None) or repr(callback)
+        _entry = self.profile.get(_name)
+        # new entry?
+        if _entry is None:
+            _entry = self.profile[_name] = dict(
+                scheduled=0, run=0,
+                late_total=0.0, late_max=0.0,
+                time_total=0.0, time_max=0.0,
+            )
+        # end if
+        return _entry
+    # end def
+
+
+    def _profile_run (self, callback, *args):
+        """
+            protected method - runs @callback and records how late
+            it fired and how long it took (in milliseconds);
+        """
+        # inits
+        _entry = self._profile_entry(callback)
+        _start = time.perf_counter() * 1000
+        _due = self.profile_due.pop(callback, None)
+        # fired late?
+        if _due is not None:
+            _late = max(0.0, _start - _due)
+            _entry["late_total"] += _late
+            _entry["late_max"] = max(_entry["late_max"], _late)
         # end if
+        # run callback
+        try:
+            callback(*args)
+        finally:
+            _time = time.perf_counter() * 1000 - _start
+            _entry["run"] += 1
+            _entry["time_total"] += _time
+            _entry["time_max"] = max(_entry["time_max"], _time)
+        # end try
+    # end def
+
+
+    def _profile_scheduled (self, callback, delay):
+        """
+            protected method - records @callback scheduling with
+            requested @delay (in milliseconds);
+        """
+        self._profile_entry(callback)["scheduled"] += 1
+        self.profile_due[callback] = time.perf_counter() * 1000 + delay
     # end def
 
 
@@ -93,6 +175,67 @@ class TkGameAnimationPool:
     # end def
 
 
+    def dump_profile (self, file_path=None):
+        """
+            writes profiling stats as a text table sorted by total
+            time spent in callbacks, either appending to @file_path
+            or printing to stdout if omitted;
+        """
+        # inits
+        _lines = [
+            "{:<48} {:>9} {:>9} {:>10} {:>10} {:>10} {:>10}".format(
+                "callback", "scheduled", "run", "late avg", "late max",
+                "time tot", "time max"
+            )
+        ]
+        _stats = sorted(
+            self.get_profile().items(),
+            key=lambda item: item[1]["time_total"],
+            reverse=True,
+        )
+        # browse stats
+        for _name, _entry in _stats:
+            _lines.append(
+                "{:<48} {:>9} {:>9} {:>10.2f} {:>10.2f} {:>10.2f} {:>10.2f}"
+                .format(
+                    _name[-48:], _entry["scheduled"], _entry["run"],
+                    _entry["late_avg"], _entry["late_max"],
+                    _entry["time_total"], _entry["time_max"],
+                )
+            )
+        # end for
+        _text = "\n".join(_lines) + "\n"
+        # output
+        if file_path:
+            with open(file_path, "a") as file_out:
+                file_out.write(_text + "\n")
+            # end with
+        else:
+            print(_text)
+        # end if
+    # end def
+
+
+    def get_profile (self):
+        """
+            returns a snapshot of profiling stats as a dict() of
+            callback qualified names with dict() values:
+            'scheduled', 'run': number of schedulings and runs,
+            'late_avg', 'late_max': firing delay past requested
+            due time, 'time_total', 'time_max': time spent inside
+            callback; all times are in milliseconds;
+        """
+        # inits
+        _snapshot = dict()
+        # browse stats
+        for _name, _entry in self.profile.items():
+            _entry = _snapshot[_name] = _entry.copy()
+            _entry["late_avg"] = _entry["late_total"] / (_entry["run"] or 1)
+        # end for
+        return _snapshot
+    # end def
+
+
     def lock (self, *callbacks):
         """
             stops and then locks scheduled threads, if any;
@@ -115,6 +258,22 @@ class TkGameAnimationPool:
     # end def
 
 
+    def profile_dump_loop (self, delay, file_path=None):
+        """
+            periodic profiling stats dump loop;
+            runs on its own tkinter after() thread so that
+            clear_all() does not stop it;
+        """
+        # still profiling?
+        if self.profiling:
+            self.dump_profile(file_path)
+            self.profile_dump_id = self.root.after(
+                delay, self.profile_dump_loop, delay, file_path
+            )
+        # end if
+    # end def
+
+
     def release (self, *callbacks):
         """
             releases listed threads lockers, if any;
@@ -148,6 +307,10 @@ class TkGameAnimationPool:
         delay = max(1, int(delay))
         # stop previous running thread, if any
         self.stop(callback)
+        # profiling
+        if self.profiling:
+            self._profile_scheduled(callback, delay)
+        # end if
         # schedule new thread id for further call
         self.tid[callback] = self.root.after(
             delay, self._atomic, callback, *args
@@ -162,6 +325,10 @@ class TkGameAnimationPool:
         """
         # stop previous running thread, if any
         self.stop(callback)
+        # profiling
+        if self.profiling:
+            self._profile_scheduled(callback, 0)
+        # end if
         # schedule new thread id for further call
         self.tid[callback] = self.root.after_idle(
             self._atomic, callback, *args
@@ -169,6 +336,29 @@ class TkGameAnimationPool:
     # end def
 
 
+    def start_profiling (self, dump_delay=None, file_path=None):
+        """
+            enables per-callback profiling;
+            stats are cleared up;
+            if @dump_delay is given (in milliseconds), stats are
+            periodically dumped to @file_path or to stdout if
+            omitted (see dump_profile());
+        """
+        # inits
+        self.stop_profiling()
+        self.profile.clear()
+        self.profile_due.clear()
+        self.profiling = True
+        # periodic dumps
+        if dump_delay:
+            dump_delay = max(1, int(dump_delay))
+            self.profile_dump_id = self.root.after(
+                dump_delay, self.profile_dump_loop, dump_delay, file_path
+            )
+        # end if
+    # end def
+
+
     def stop (self, *callbacks):
         """
             stops scheduled threads, if any;
@@ -183,6 +373,21 @@ class TkGameAnimationPool:
     # end def
 
 
+    def stop_profiling (self):
+        """
+            disables per-callback profiling;
+            collected stats remain available (see get_profile());
+        """
+        # inits
+        self.profiling = False
+        # stop periodic dumps
+        if self.profile_dump_id is not None:
+            self.root.after_cancel(self.profile_dump_id)
+            self.profile_dump_id = None
+        # end if
+    # end def
+
+
     def stop_all (self, *args, **kw):
         """
             event handler;
@@ -199,3 +404,185 @@ class TkGameAnimationPool:
     # end def
 
 # end class TkGameAnimationPool
+
+
+class TkGameTimerWheelPool (TkGameAnimationPool):
+    """
+        Animation pool multiplexing all scheduled callbacks onto
+        one single recurring tkinter after() callback;
+        callbacks are kept in a min-heap keyed by due time and
+        fired by a tick running every RESOLUTION milliseconds
+        while some callback is pending;
+    """
+
+    # class constants
+    RESOLUTION = 10     # tick delay in milliseconds
+
+
+    def __init__ (self):
+        """
+            class constructor
+        """
+        # super class inits
+        super().__init__()
+        # min-heap of (due time, sequence, callback, args) items
+        self.queue = list()
+        self.sequence = 0
+        # recurring tick thread id
+        self.tick_id = None
+        # incremented by self.stop_all(): outdated ticks do nothing
+        self.generation = 0
+        # tick stats
+        self.stats = dict(ticks=0, fired=0, last_fired=0, max_fired=0)
+    # end def
+
+
+    def _now (self):
+        """
+            protected method - current time in milliseconds;
+        """
+        return time.monotonic() * 1000
+    # end def
+
+
+    def _schedule (self, delay, callback, *args):
+        """
+            protected method - pushes callback into queue;
+        """
+        # stop previous running thread, if any
+        self.stop(callback)
+        # profiling
+        if self.profiling:
+            self._profile_scheduled(callback, delay)
+        # end if
+        # new thread id
+        self.sequence += 1
+        self.tid[callback] = self.sequence
+        heapq.heappush(
+            self.queue,
+            (self._now() + delay, self.sequence, callback, args)
+        )
+        # too many cancelled items?
+        if len(self.queue) > 2 * len(self.tid) + 64:
+            self.queue = [
+                _item for _item in self.queue
+                if self.tid.get(_item[2]) == _item[1]
+            ]
+            heapq.heapify(self.queue)
+        # end if
+        # start ticking, if not already done
+        self._start_ticking()
+    # end def
+
+
+    def _start_ticking (self):
+        """
+            protected method - schedules next tick, if needed and
+            not already done; this is the only place where ticks
+            get scheduled;
+        """
+        if self.tick_id is None and self.queue:
+            self.tick_id = self.root.after(
+                self.RESOLUTION, self._tick, self.generation
+            )
+        # end if
+    # end def
+
+
+    def _tick (self, generation):
+        """
+            protected method - recurring tick;
+            fires all due callbacks; a failing callback neither
+            stops other callbacks nor ticking;
+        """
+        # outdated tick?
+        if generation != self.generation:
+            return
+        # end if
+        # inits
+        self.tick_id = None
+        _now = self._now()
+        _fired = 0
+        try:
+            # due callbacks (until stopped by self.stop_all())
+            while self.generation == generation \
+                    and self.queue and self.queue[0][0] <= _now:
+                _due, _sequence, _callback, _args = heapq.heappop(self.queue)
+                # still scheduled (neither stopped nor rescheduled)?
+                if self.tid.get(_callback) == _sequence:
+                    del self.tid[_callback]
+                    _fired += 1
+                    self._atomic(_callback, *_args)
+                # end if
+            # end while
+        finally:
+            # update stats
+            self.stats["ticks"] += 1
+            self.stats["fired"] += _fired
+            self.stats["last_fired"] = _fired
+            self.stats["max_fired"] = max(self.stats["max_fired"], _fired)
+            # keep on ticking only if needed
+            self._start_ticking()
+        # end try
+    # end def
+
+
+    def get_stats (self):
+        """
+            returns a copy of tick stats dict():
+            'ticks': number of ticks so far,
+            'fired': total number of fired callbacks,
+            'last_fired': callbacks fired by the last tick,
+            'max_fired': max callbacks fired by one single tick;
+        """
+        return self.stats.copy()
+    # end def
+
+
+    def run_after (self, delay, callback, *args):
+        """
+            runs a delayed thread;
+            parameter @delay is in milliseconds;
+        """
+        self._schedule(max(1, int(delay)), callback, *args)
+    # end def
+
+
+    def run_after_idle (self, callback, *args):
+        """
+            runs a delayed thread at next tick;
+        """
+        self._schedule(0, callback, *args)
+    # end def
+
+
+    def stop (self, *callbacks):
+        """
+            stops scheduled threads, if any;
+        """
+        # browse list of callbacks
+        for _cb in callbacks:
+            # queued item will be ignored when due
+            self.tid.pop(_cb, None)
+        # end for
+    # end def
+
+
+    def stop_all (self, *args, **kw):
+        """
+            event handler;
+            stops all scheduled threads and recurring tick;
+            clears up all thread ids dictionary;
+        """
+        # stop recurring tick
+        self.generation += 1
+        if self.tick_id is not None:
+            self.root.after_cancel(self.tick_id)
+            self.tick_id = None
+        # end if
+        # clear all
+        self.queue.clear()
+        self.tid.clear()
+    # end def
+
+# end class TkGameTimerWheelPool
@@ -23,16 +23,44 @@
 """
 
 # lib imports
+import array
+import collections
+import json
 import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import wave
 
 
 # debugging mode
 DEBUG = False
 #~ DEBUG = True
 
+# run audio player commands off Tk mainloop
+QUEUED_PLAYERS = True
 
-# module private member
+# audio backends in probing order
+# (GStreamer decodes and mixes in native threads, so it comes
+# before the pure Python mixer, which shares the GIL with Tk)
+BACKENDS = ("windows", "gst", "mixer")
+
+# environment variable forcing audio backend
+# (one of BACKENDS or 'silent')
+BACKEND_ENV = "TKGAME_AUDIO"
+
+# file path to persist detected backend across runs (None: off)
+BACKEND_CACHE = None
+BACKEND_CACHE_TTL = 7 * 24 * 3600   # in seconds
+
+
+# module private members
 __player_class = object
+__audio_mixer = None
+__audio_worker = None
+__backend_stats = dict()
 
 
 def tron (message, *args, **kw):
@@ -45,38 +73,198 @@ def tron (message, *args, **kw):
 # end def
 
 
+def detect_backend (*args, **kw):
+    """
+        looks for available audio backend: backend forced by
+        BACKEND_ENV environment variable, if any; backend
+        persisted in BACKEND_CACHE file, if still valid;
+        first supported one in BACKENDS, otherwise;
+        @args and @kw are passed to backend class for probing;
+        returns backend name ('silent' if none is supported);
+    """
+    global __backend_stats
+    # inits
+    _start = time.perf_counter()
+    _tried = list()
+    _forced = os.environ.get(BACKEND_ENV, "").strip().lower()
+    _cached = None if _forced else load_backend_cache()
+    _source = "env" if _forced else "cache" if _cached else "probe"
+    _backend = "silent"
+    # browse candidates
+    _names = (_forced,) if _forced else (_cached,) + BACKENDS
+    for _name in filter(None, _names):
+        # inits
+        _class = get_backend_class(_name)
+        if not _class:
+            tron("unknown player type:", _name)
+            continue
+        # end if
+        _time = time.perf_counter()
+        try:
+            _class(*args, **kw)
+            _ok = True
+        except Exception:
+            # debugging session
+            tron("unsupported player type:", _class.__name__)
+            _ok = False
+        # end try
+        _tried.append((_name, _ok, (time.perf_counter() - _time) * 1000))
+        # got it?
+        if _ok:
+            _backend = _name
+            break
+        # end if
+        # cached backend is no longer supported
+        if _source == "cache":
+            _source = "probe"
+        # end if
+    # end for
+    # keep stats
+    __backend_stats = dict(
+        backend=_backend,
+        source=_source,
+        time=(time.perf_counter() - _start) * 1000,
+        tried=_tried,
+    )
+    # debugging session
+    tron("audio backend detection:", __backend_stats)
+    # persist newly probed backend
+    if _source == "probe":
+        save_backend_cache(_backend)
+    # end if
+    return _backend
+# end def
+
+
+def get_audio_mixer ():
+    """
+        app-wide unique instance getter;
+        raises OSError if no audio output is available;
+    """
+    global __audio_mixer
+    if not isinstance(__audio_mixer, AudioMixer):
+        __audio_mixer = AudioMixer()
+    # end if
+    return __audio_mixer
+# end def
+
+
+def get_audio_worker ():
+    """
+        app-wide unique instance getter;
+    """
+    global __audio_worker
+    if not isinstance(__audio_worker, AudioCommandWorker):
+        __audio_worker = AudioCommandWorker()
+    # end if
+    return __audio_worker
+# end def
+
+
+def get_backend_class (name):
+    """
+        returns audio player class for backend @name;
+        returns None if unknown;
+    """
+    return {
+        "windows": WindowsAudioPlayer,
+        "mixer": MixerAudioPlayer,
+        "gst": GstAudioPlayer,
+        "silent": SilentAudioPlayer,
+    }.get(name)
+# end def
+
+
+def get_backend_stats ():
+    """
+        returns audio backend detection stats as a dict() with keys
+        'backend' (backend name), 'source' ('env', 'cache' or
+        'probe'), 'time' (detection time in ms) and 'tried'
+        (list of (backend name, supported, time in ms) tuples);
+        returns empty dict() if detection has not been done yet;
+    """
+    return dict(__backend_stats)
+# end def
+
+
+def load_backend_cache ():
+    """
+        returns backend name persisted in BACKEND_CACHE file, if
+        any and still valid for current platform and BACKENDS
+        probing order;
+        returns None otherwise;
+    """
+    # no persistence?
+    if not BACKEND_CACHE:
+        return None
+    # end if
+    try:
+        with open(BACKEND_CACHE) as file_in:
+            _cache = json.load(file_in)
+        # end with
+        if _cache["platform"] == sys.platform \
+                and _cache["backends"] == list(BACKENDS) \
+                and time.time() - _cache["time"] < BACKEND_CACHE_TTL:
+            return _cache["backend"]
+        # end if
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    # end try
+    return None
+# end def
+
+
 def new_audio_player (*args, **kw):
     """
-        looks for available audio player;
+        looks for available audio player, once for all;
         returns new instance of audio player if supported;
         returns SilentAudioPlayer instance otherwise;
+        supported audio players get wrapped into a
+        QueuedAudioPlayer if QUEUED_PLAYERS is True;
     """
     global __player_class
     # got to look out?
     if not issubclass(__player_class, BaseAudioPlayer):
-        # supported audio player types
-        supported = (WindowsAudioPlayer, GstAudioPlayer)
-        for ptype in supported:
-            try:
-                ptype(*args, **kw)
-                __player_class = ptype
-                break
-            except:
-                # debugging session
-                tron("unsupported player type:", ptype.__name__)
-                __player_class = None
-            # end try
-        # end for
-        # set default if unsupported
-        __player_class = __player_class or SilentAudioPlayer
+        __player_class = get_backend_class(detect_backend(*args, **kw))
     # end if
     # debugging session
     tron("instantiating player type:", __player_class.__name__)
+    # run commands off Tk mainloop?
+    if QUEUED_PLAYERS and __player_class is not SilentAudioPlayer:
+        return QueuedAudioPlayer(__player_class(*args, **kw))
+    # end if
     # return new player instance
     return __player_class(*args, **kw)
 # end def
 
 
+def save_backend_cache (backend):
+    """
+        persists @backend name in BACKEND_CACHE file, if any;
+    """
+    # no persistence?
+    if not BACKEND_CACHE:
+        return
+    # end if
+    try:
+        os.makedirs(os.path.dirname(BACKEND_CACHE) or ".", exist_ok=True)
+        with open(BACKEND_CACHE, "w") as file_out:
+            json.dump(
+                dict(
+                    backend=backend,
+                    backends=list(BACKENDS),
+                    platform=sys.platform,
+                    time=time.time(),
+                ),
+                file_out
+            )
+        # end with
+    except OSError as e:
+        tron("could not save audio backend cache:", e)
+    # end try
+# end def
+
+
 class BaseAudioPlayer:
     """
         Generic asynchronous audio player class (interface);
@@ -252,8 +440,14 @@ class WindowsAudioPlayer (BaseAudioPlayer):
 class GstAudioPlayer (BaseAudioPlayer):
     """
         GNOME GStreamer audio playback wrapper class;
+        playing the same URI again after self.stop() resumes
+        from where it stopped (e.g. background music);
     """
 
+    # class constants
+    PREROLL_TIMEOUT = 500   # max wait before seeking (in milliseconds)
+
+
     def __init__ (self, volume=None):
         """ Class initialiser """
         global GObject, Gst
@@ -266,6 +460,9 @@ class GstAudioPlayer (BaseAudioPlayer):
         GObject.threads_init()
         Gst.init()
         self.player = Gst.ElementFactory.make("playbin")
+        # resume inits (see stop())
+        self.last_uri = None
+        self.position = 0
     # end def
 
 
@@ -284,11 +481,26 @@ class GstAudioPlayer (BaseAudioPlayer):
         volume = max(0.0, min(2.0, float(volume)))
         # reset player
         self.stop()
+        # same URI as last stopped one?
+        _position = self.position if uri == self.last_uri else 0
+        self.last_uri = uri
         # debugging session
-        tron("playing audio data from URI:", uri)
+        tron("playing audio data from URI:", uri, "at", _position)
         # init player
         self.player.set_property("uri", uri)
         self.player.set_property("volume", volume)
+        # resume from last stop position
+        if _position:
+            # seeking needs a prerolled pipeline
+            # (player commands run off Tk mainloop, see QUEUED_PLAYERS)
+            self.player.set_state(Gst.State.PAUSED)
+            self.player.get_state(self.PREROLL_TIMEOUT * Gst.MSECOND)
+            self.player.seek_simple(
+                Gst.Format.TIME,
+                Gst.SeekFlags.FLUSH | Gst.SeekFlags.KEY_UNIT,
+                _position
+            )
+        # end if
         self.player.set_state(Gst.State.PLAYING)
     # end def
 
@@ -306,7 +518,16 @@ class GstAudioPlayer (BaseAudioPlayer):
     def stop (self):
         """
             stops playback for eventual pending audio data;
+            keeps current position for resuming (see self.play());
         """
+        # keep current position unless playback is over
+        _ok, _position = self.player.query_position(Gst.Format.TIME)
+        if _ok:
+            _ok, _duration = self.player.query_duration(Gst.Format.TIME)
+            self.position = (
+                0 if _ok and _position >= _duration else _position
+            )
+        # end if
         # stop playing audio data
         self.player.set_state(Gst.State.NULL)
         # CAUTION:
@@ -317,3 +538,1126 @@ class GstAudioPlayer (BaseAudioPlayer):
     # end def
 
 # end class GstAudioPlayer
+
+
+class BaseAudioSink:
+    """
+        Generic audio output for AudioMixer (interface);
+        receives raw signed 16-bit little-endian PCM data;
+    """
+
+    def close (self):
+        """
+            closes audio output;
+        """
+        pass
+    # end def
+
+
+    def open (self, rate, channels):
+        """
+            opens audio output for @rate frames per second and
+            @channels interleaved channels;
+            raises OSError if audio output is not available;
+        """
+        pass
+    # end def
+
+
+    def write (self, data):
+        """
+            outputs @data raw PCM bytes;
+            may block until audio output is ready for more data;
+        """
+        pass
+    # end def
+
+# end class BaseAudioSink
+
+
+class NullAudioSink (BaseAudioSink):
+    """
+        Audio output discarding data, e.g. for testing purposes;
+        keeps count of written frames;
+    """
+
+    def __init__ (self):
+        """ Class initialiser """
+        self.frames = 0
+        self.frame_size = 4
+    # end def
+
+
+    def open (self, rate, channels):
+        """
+            opens audio output;
+        """
+        self.frames = 0
+        self.frame_size = 2 * channels
+    # end def
+
+
+    def write (self, data):
+        """
+            counts written frames;
+        """
+        self.frames += len(data) // self.frame_size
+    # end def
+
+# end class NullAudioSink
+
+
+class WaveFileAudioSink (BaseAudioSink):
+    """
+        Audio output to a WAV file, e.g. for testing purposes;
+    """
+
+    def __init__ (self, file_path):
+        """ Class initialiser """
+        self.file_path = file_path
+        self.file_out = None
+    # end def
+
+
+    def close (self):
+        """
+            closes WAV file;
+        """
+        if self.file_out:
+            self.file_out.close()
+            self.file_out = None
+        # end if
+    # end def
+
+
+    def open (self, rate, channels):
+        """
+            opens WAV file for writing;
+        """
+        self.close()
+        self.file_out = wave.open(self.file_path, "wb")
+        self.file_out.setnchannels(channels)
+        self.file_out.setsampwidth(2)
+        self.file_out.setframerate(rate)
+    # end def
+
+
+    def write (self, data):
+        """
+            appends data to WAV file;
+        """
+        if self.file_out:
+            self.file_out.writeframes(data)
+        # end if
+    # end def
+
+# end class WaveFileAudioSink
+
+
+class PipeAudioSink (BaseAudioSink):
+    """
+        Audio output piped to a command line audio player
+        (ALSA 'aplay' or PulseAudio 'pacat'); pipe writes block
+        as long as audio device is busy, which paces mixing;
+    """
+
+    # class constants
+    COMMANDS = (
+        (
+            "aplay", "-q", "-t", "raw", "-f", "S16_LE",
+            "-c", "{channels}", "-r", "{rate}", "--buffer-time=50000",
+        ),
+        (
+            "pacat", "--playback", "--raw", "--format=s16le",
+            "--channels={channels}", "--rate={rate}", "--latency-msec=50",
+        ),
+    )
+
+
+    def __init__ (self, command=None):
+        """ Class initialiser """
+        self.command = command
+        self.process = None
+    # end def
+
+
+    def close (self):
+        """
+            closes pipe to audio player;
+        """
+        if self.process:
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+            # end try
+            self.process.wait()
+            self.process = None
+        # end if
+    # end def
+
+
+    def open (self, rate, channels):
+        """
+            launches audio player command;
+            raises OSError if no audio player command is available;
+        """
+        # inits
+        _commands = (self.command,) if self.command else self.COMMANDS
+        # look for available command
+        for _command in _commands:
+            if shutil.which(_command[0]):
+                self.close()
+                self.process = subprocess.Popen(
+                    [
+                        _arg.format(rate=rate, channels=channels)
+                        for _arg in _command
+                    ],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+                return
+            # end if
+        # end for
+        raise OSError("no command line audio player available")
+    # end def
+
+
+    def write (self, data):
+        """
+            pipes data to audio player;
+        """
+        if self.process:
+            try:
+                self.process.stdin.write(data)
+                self.process.stdin.flush()
+            except OSError:
+                # audio player has gone away
+                tron("audio player pipe closed.")
+                self.process = None
+            # end try
+        # end if
+    # end def
+
+# end class PipeAudioSink
+
+
+class AudioSoundBank:
+    """
+        In-memory cache of decoded WAV files;
+        sounds are kept as signed 16-bit PCM arrays with
+        interleaved channels, ready for mixing;
+    """
+
+    def __init__ (self, rate=44100, channels=2):
+        """ Class initialiser """
+        self.rate = rate
+        self.channels = channels
+        self.sounds = dict()
+    # end def
+
+
+    def convert_frames (self, data, width, channels, rate):
+        """
+            converts @data raw WAV frames of @width bytes samples,
+            @channels channels and @rate frame rate into a signed
+            16-bit PCM array along self.rate and self.channels;
+            raises wave.Error if format is not supported;
+        """
+        # inits
+        _data, _width, _channels, _rate = data, width, channels, rate
+        # sample format
+        if _width == 1:
+            _samples = array.array("h", ((_b - 128) << 8 for _b in _data))
+        elif _width == 2:
+            _samples = array.array("h", _data)
+            if sys.byteorder == "big":
+                _samples.byteswap()
+            # end if
+        else:
+            raise wave.Error("unsupported sample width: {}".format(_width))
+        # end if
+        # channels
+        if _channels == 1 and self.channels == 2:
+            _stereo = array.array("h", bytes(4 * len(_samples)))
+            _stereo[0::2] = _samples
+            _stereo[1::2] = _samples
+            _samples = _stereo
+        elif _channels != self.channels:
+            raise wave.Error("unsupported channels: {}".format(_channels))
+        # end if
+        # frame rate (nearest neighbour)
+        if _rate != self.rate:
+            _count = len(_samples) // self.channels
+            _samples = array.array(
+                "h",
+                (
+                    _samples[
+                        (_i * _rate // self.rate) * self.channels + _c
+                    ]
+                    for _i in range(_count * self.rate // _rate)
+                    for _c in range(self.channels)
+                )
+            )
+        # end if
+        return _samples
+    # end def
+
+
+    def decode_wave (self, file_path):
+        """
+            decodes @file_path WAV file into a signed 16-bit PCM
+            array along self.rate and self.channels;
+            raises OSError or wave.Error on failure;
+        """
+        with wave.open(file_path, "rb") as file_in:
+            return self.convert_frames(
+                file_in.readframes(file_in.getnframes()),
+                file_in.getsampwidth(),
+                file_in.getnchannels(),
+                file_in.getframerate(),
+            )
+        # end with
+    # end def
+
+
+    def get_sound (self, file_path):
+        """
+            returns decoded sound for @file_path, decoding WAV file
+            on first call only; returns None on failure;
+        """
+        # inits
+        file_path = os.path.abspath(file_path)
+        # not already decoded?
+        if file_path not in self.sounds:
+            try:
+                self.sounds[file_path] = self.decode_wave(file_path)
+            except (OSError, EOFError, wave.Error) as e:
+                tron("could not decode {}: {}".format(file_path, e))
+                self.sounds[file_path] = None
+            # end try
+        # end if
+        return self.sounds[file_path]
+    # end def
+
+# end class AudioSoundBank
+
+
+class AudioStream:
+    """
+        Streamed WAV file;
+        audio data gets decoded chunk by chunk into a small ring
+        buffer, so that only a few chunks are ever resident in
+        memory, whatever the track length;
+    """
+
+    # class constants
+    RING_SIZE = 8           # decoded chunks in ring buffer
+
+
+    def __init__ (self, file_path, bank, chunk=1024):
+        """
+            class constructor;
+            @bank is the AudioSoundBank converting decoded data;
+            @chunk is the number of frames per decoded chunk;
+            raises OSError or wave.Error on failure;
+        """
+        # member inits
+        self.file_path = file_path
+        self.bank = bank
+        self.chunk = chunk
+        self.ring = collections.deque()
+        self.rest = array.array("h")
+        self.lock = threading.Lock()
+        self.position = 0
+        self.file_in = wave.open(file_path, "rb")
+        self.format = (
+            self.file_in.getsampwidth(),
+            self.file_in.getnchannels(),
+            self.file_in.getframerate(),
+        )
+        self.eof = False
+    # end def
+
+
+    def _fill (self, count):
+        """
+            decodes up to @count chunks into ring buffer;
+            lock must be held by caller;
+        """
+        while count > 0 and self.file_in and not self.eof:
+            _data = self.file_in.readframes(self.chunk)
+            if not _data:
+                self.eof = True
+                break
+            # end if
+            self.ring.append(self.bank.convert_frames(_data, *self.format))
+            count -= 1
+        # end while
+    # end def
+
+
+    def close (self):
+        """
+            closes WAV file and drops ring buffer;
+        """
+        with self.lock:
+            if self.file_in:
+                self.file_in.close()
+                self.file_in = None
+            # end if
+            self.ring.clear()
+            self.rest = array.array("h")
+        # end with
+    # end def
+
+
+    def fill (self):
+        """
+            tops up ring buffer with decoded chunks;
+        """
+        with self.lock:
+            self._fill(self.RING_SIZE - len(self.ring))
+        # end with
+    # end def
+
+
+    @property
+    def finished (self):
+        """
+            True once all audio data has been read;
+        """
+        return (self.eof or not self.file_in) and not (self.ring or self.rest)
+    # end def
+
+
+    def read (self, size):
+        """
+            returns next @size samples as a signed 16-bit PCM array;
+            returned array is shorter than @size at end of stream;
+        """
+        with self.lock:
+            # inits
+            _samples = self.rest
+            # gather chunks
+            while len(_samples) < size:
+                # ring buffer underrun?
+                if not self.ring:
+                    self._fill(1)
+                    if not self.ring:
+                        break
+                    # end if
+                # end if
+                _samples += self.ring.popleft()
+            # end while
+            self.rest = _samples[size:]
+            _samples = _samples[:size]
+            self.position += len(_samples) // self.bank.channels
+            return _samples
+        # end with
+    # end def
+
+
+    def rewind (self):
+        """
+            restarts stream from the beginning;
+        """
+        with self.lock:
+            if self.file_in:
+                self.file_in.rewind()
+            # end if
+            self.ring.clear()
+            self.rest = array.array("h")
+            self.position = 0
+            self.eof = False
+        # end with
+    # end def
+
+# end class AudioStream
+
+
+class AudioVoice:
+    """
+        AudioMixer voice slot;
+    """
+
+    __slots__ = (
+        "data", "stream", "position", "gain", "owner", "paused", "serial"
+    )
+
+
+    def __init__ (self):
+        """ Class initialiser """
+        self.release()
+        self.serial = 0
+    # end def
+
+
+    @property
+    def active (self):
+        """
+            True if voice slot has something to play;
+        """
+        return self.data is not None or self.stream is not None
+    # end def
+
+
+    def release (self):
+        """
+            frees voice slot;
+        """
+        self.data = None
+        self.stream = None
+        self.position = 0
+        self.gain = 256
+        self.owner = None
+        self.paused = False
+    # end def
+
+# end class AudioVoice
+
+
+class AudioMixer:
+    """
+        Software audio mixer;
+        mixes a fixed pool of voices into a sink from a background
+        thread; when all voices are busy, the oldest one gets
+        stolen by any new sound (streamed voices are never stolen);
+    """
+
+    # class constants
+    RATE = 44100            # frames per second
+    CHANNELS = 2            # interleaved channels
+    CHUNK = 1024            # frames per mixed chunk
+    VOICES = 16             # voice pool size
+    UNITY = 256             # fixed-point gain for volume 1.0
+
+
+    def __init__ (self, sink=None, voices=None):
+        """ Class initialiser """
+        # member inits
+        self.sink = sink or PipeAudioSink()
+        self.bank = AudioSoundBank(self.RATE, self.CHANNELS)
+        self.voices = tuple(
+            AudioVoice() for i in range(voices or self.VOICES)
+        )
+        self.condition = threading.Condition()
+        self.thread = None
+        self.serial = 0
+        self.stolen = 0
+        self.chunks = 0
+        # open audio output (may raise OSError)
+        self.sink.open(self.RATE, self.CHANNELS)
+    # end def
+
+
+    def _mix_chunk (self):
+        """
+            mixes next chunk of active voices;
+            returns raw PCM bytes or None if nothing to play;
+        """
+        # inits
+        _size = self.CHUNK * self.CHANNELS
+        _parts = []
+        # grab voice chunks
+        with self.condition:
+            for _voice in self.voices:
+                # streamed voice
+                if _voice.stream and not _voice.paused:
+                    _chunk = _voice.stream.read(_size)
+                    if _chunk:
+                        _parts.append((_chunk, _voice.gain))
+                    # end if
+                    # stream is over?
+                    if len(_chunk) < _size:
+                        _voice.release()
+                    # end if
+                # in-memory voice
+                elif _voice.data is not None and not _voice.paused:
+                    _end = _voice.position + _size
+                    _parts.append(
+                        (_voice.data[_voice.position:_end], _voice.gain)
+                    )
+                    _voice.position = _end
+                    # voice is over?
+                    if _end >= len(_voice.data):
+                        _voice.release()
+                    # end if
+                # end if
+            # end for
+        # end with
+        # nothing to play?
+        if not _parts:
+            return None
+        # end if
+        # single voice at unity gain
+        if len(_parts) == 1 and _parts[0][1] == self.UNITY:
+            _mix = _parts[0][0]
+        # mix voices
+        else:
+            _sum = [0] * max(len(_chunk) for _chunk, _gain in _parts)
+            for _chunk, _gain in _parts:
+                _sum[:len(_chunk)] = [
+                    _acc + ((_sample * _gain) >> 8)
+                    for _acc, _sample in zip(_sum, _chunk)
+                ]
+            # end for
+            _mix = array.array(
+                "h",
+                [
+                    -32768 if _acc < -32768 else
+                    32767 if _acc > 32767 else _acc
+                    for _acc in _sum
+                ]
+            )
+        # end if
+        # little-endian output
+        if sys.byteorder == "big":
+            _mix = array.array("h", _mix)
+            _mix.byteswap()
+        # end if
+        self.chunks += 1
+        return _mix.tobytes()
+    # end def
+
+
+    def _run (self):
+        """
+            mixing thread main loop;
+        """
+        while True:
+            with self.condition:
+                # wait for something to play
+                while self.thread and not self.is_busy():
+                    self.condition.wait()
+                # end while
+                # mixer closed?
+                if not self.thread:
+                    break
+                # end if
+            # end with
+            _data = self._mix_chunk()
+            if _data:
+                self.sink.write(_data)
+            # end if
+            # top up streams off lock
+            with self.condition:
+                _streams = [_v.stream for _v in self.voices if _v.stream]
+            # end with
+            for _stream in _streams:
+                _stream.fill()
+            # end for
+        # end while
+    # end def
+
+
+    def close (self):
+        """
+            stops mixing thread and closes audio output;
+        """
+        # inits
+        _thread = self.thread
+        # stop thread
+        with self.condition:
+            self.thread = None
+            for _voice in self.voices:
+                _voice.release()
+            # end for
+            self.condition.notify_all()
+        # end with
+        if _thread and _thread is not threading.current_thread():
+            _thread.join()
+        # end if
+        self.sink.close()
+    # end def
+
+
+    def get_voice (self, voice, owner):
+        """
+            returns @voice if still owned by @owner (voices may
+            have been stolen meanwhile), None otherwise;
+        """
+        if voice is not None and voice.owner is owner:
+            return voice
+        # end if
+    # end def
+
+
+    def is_busy (self):
+        """
+            returns True if any voice has something to play;
+        """
+        return any(
+            _voice.active and not _voice.paused for _voice in self.voices
+        )
+    # end def
+
+
+    def pause_voice (self, voice, owner, paused=True):
+        """
+            pauses (or resumes) @voice if still owned by @owner;
+        """
+        with self.condition:
+            _voice = self.get_voice(voice, owner)
+            if _voice:
+                _voice.paused = paused
+                self.condition.notify_all()
+            # end if
+        # end with
+    # end def
+
+
+    def play (self, sound, volume, owner):
+        """
+            starts playing @sound PCM array (or AudioStream) at
+            @volume level on behalf of @owner, stealing oldest voice
+            if none is free;
+            returns voice slot or None if all voices are streamed;
+        """
+        with self.condition:
+            # look for free voice
+            for _voice in self.voices:
+                if not _voice.active:
+                    break
+                # end if
+            # steal oldest voice
+            else:
+                _voice = min(
+                    (_v for _v in self.voices if not _v.stream),
+                    key=lambda v: v.serial,
+                    default=None
+                )
+                if not _voice:
+                    return None
+                # end if
+                self.stolen += 1
+                tron("voice stolen from:", _voice.owner)
+            # end for
+            # init voice
+            _voice.release()
+            self.serial += 1
+            if isinstance(sound, AudioStream):
+                _voice.stream = sound
+            else:
+                _voice.data = sound
+            # end if
+            _voice.position = 0
+            _voice.gain = int(volume * self.UNITY)
+            _voice.owner = owner
+            _voice.paused = False
+            _voice.serial = self.serial
+            # start mixing thread
+            if not self.thread:
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+            # end if
+            self.condition.notify_all()
+        # end with
+        return _voice
+    # end def
+
+
+    def set_voice_volume (self, voice, owner, volume):
+        """
+            sets @voice volume level if still owned by @owner;
+        """
+        with self.condition:
+            _voice = self.get_voice(voice, owner)
+            if _voice:
+                _voice.gain = int(volume * self.UNITY)
+            # end if
+        # end with
+    # end def
+
+
+    def stop_voice (self, voice, owner):
+        """
+            stops @voice if still owned by @owner;
+        """
+        with self.condition:
+            _voice = self.get_voice(voice, owner)
+            if _voice:
+                _voice.release()
+            # end if
+        # end with
+    # end def
+
+# end class AudioMixer
+
+
+class MixerAudioPlayer (BaseAudioPlayer):
+    """
+        Software mixer audio playback class;
+        sounds are decoded once into memory and mixed by the
+        app-wide AudioMixer, so that playing a sound effect costs
+        no disk I/O nor audio pipeline set up;
+        each player instance plays one sound at a time, just like
+        any other audio player;
+        files bigger than self.STREAM_SIZE (e.g. background music)
+        get streamed instead; playing the same streamed file again
+        after self.stop() resumes from where it stopped;
+    """
+
+    # class constants
+    STREAM_SIZE = 1 << 20   # stream files bigger than this (in bytes)
+
+
+    def __init__ (self, volume=None, mixer=None):
+        """ Class initialiser """
+        # super class inits
+        super().__init__(volume)
+        # member inits
+        self.voice = None
+        self.stream = None
+        self.mixer = None
+        self.mixer = mixer or get_audio_mixer()
+    # end def
+
+
+    def get_stream (self, file_path):
+        """
+            returns AudioStream for @file_path, keeping current
+            stream position if already streaming this file;
+            returns None on failure;
+        """
+        # inits
+        file_path = os.path.abspath(file_path)
+        # same file?
+        if self.stream and self.stream.file_path == file_path:
+            # start over once over
+            if self.stream.finished:
+                self.stream.rewind()
+            # end if
+            return self.stream
+        # end if
+        # new file
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        # end if
+        try:
+            self.stream = AudioStream(
+                file_path, self.mixer.bank, self.mixer.CHUNK
+            )
+        except (OSError, EOFError, wave.Error) as e:
+            tron("could not stream {}: {}".format(file_path, e))
+        # end try
+        return self.stream
+    # end def
+
+
+    def on_garbage_collection (self):
+        """
+            hook method to be reimplemented in subclass;
+        """
+        # stop playing
+        self.stop()
+        # release streamed file
+        if self.stream:
+            self.stream.close()
+        # end if
+    # end def
+
+
+    def pause (self):
+        """
+            pauses audio data playback;
+        """
+        if self.mixer:
+            self.mixer.pause_voice(self.voice, self, True)
+        # end if
+    # end def
+
+
+    def play (self, uri, volume=None):
+        """
+            plays audio data retrieved from @uri with @volume;
+            only local WAV files are supported;
+        """
+        # param controls
+        if uri.startswith("file://"):
+            uri = uri[len("file://"):]
+        # end if
+        if volume is None:
+            volume = self.volume
+        # end if
+        volume = max(0.0, min(2.0, float(volume)))
+        # reset player
+        self.stop()
+        # debugging session
+        tron("playing audio data from URI:", uri)
+        # inits
+        try:
+            _streamed = os.path.getsize(uri) > self.STREAM_SIZE
+        except OSError:
+            _streamed = False
+        # end try
+        if _streamed:
+            _sound = self.get_stream(uri)
+        else:
+            _sound = self.mixer.bank.get_sound(uri)
+        # end if
+        # play sound
+        if _sound:
+            self.voice = self.mixer.play(_sound, volume, self)
+        # end if
+    # end def
+
+
+    def resume (self):
+        """
+            resumes audio data playback;
+        """
+        if self.mixer:
+            self.mixer.pause_voice(self.voice, self, False)
+        # end if
+    # end def
+
+
+    def set_volume (self, volume):
+        """
+            sets volume of audio data playback;
+        """
+        # param controls
+        self.volume = max(0.0, min(2.0, float(volume)))
+        if self.mixer:
+            self.mixer.set_voice_volume(self.voice, self, self.volume)
+        # end if
+    # end def
+
+
+    def stop (self):
+        """
+            stops playback for eventual pending audio data;
+        """
+        if self.mixer:
+            self.mixer.stop_voice(self.voice, self)
+        # end if
+        self.voice = None
+        # debugging session
+        tron("stopped audio playback.")
+    # end def
+
+# end class MixerAudioPlayer
+
+
+class AudioCommandWorker:
+    """
+        Audio commands queue run by a background thread, so that
+        slow audio backends never block Tk mainloop;
+        queue is bounded: when full, oldest commands get dropped;
+    """
+
+    # class constants
+    QUEUE_SIZE = 64         # max pending commands
+
+
+    def __init__ (self, queue_size=None):
+        """ Class initialiser """
+        # member inits
+        self.queue = collections.deque()
+        self.queue_size = queue_size or self.QUEUE_SIZE
+        self.condition = threading.Condition()
+        self.thread = None
+        self.busy = False
+        self.stats = dict(
+            commands=0, dropped=0, errors=0,
+            wait_total=0.0, wait_max=0.0, run_total=0.0, run_max=0.0,
+        )
+    # end def
+
+
+    def _run (self):
+        """
+            worker thread main loop;
+        """
+        # inits
+        _stats = self.stats
+        # loop on commands
+        while True:
+            with self.condition:
+                self.busy = False
+                self.condition.notify_all()
+                # wait for commands
+                while self.thread and not self.queue:
+                    self.condition.wait()
+                # end while
+                # worker closed?
+                if not self.thread:
+                    break
+                # end if
+                _posted, _callback, _args = self.queue.popleft()
+                self.busy = True
+            # end with
+            # run command
+            _start = time.perf_counter()
+            try:
+                _callback(*_args)
+            except Exception as e:
+                tron("audio command failed:", _callback, e)
+                _stats["errors"] += 1
+            # end try
+            _end = time.perf_counter()
+            # update stats
+            with self.condition:
+                _wait = (_start - _posted) * 1000
+                _run = (_end - _start) * 1000
+                _stats["commands"] += 1
+                _stats["wait_total"] += _wait
+                _stats["wait_max"] = max(_stats["wait_max"], _wait)
+                _stats["run_total"] += _run
+                _stats["run_max"] = max(_stats["run_max"], _run)
+            # end with
+        # end while
+    # end def
+
+
+    def close (self):
+        """
+            stops worker thread; pending commands are dropped;
+        """
+        # inits
+        _thread = self.thread
+        # stop thread
+        with self.condition:
+            self.thread = None
+            self.queue.clear()
+            self.condition.notify_all()
+        # end with
+        if _thread and _thread is not threading.current_thread():
+            _thread.join()
+        # end if
+    # end def
+
+
+    def flush (self, timeout=None):
+        """
+            waits until all pending commands have been run;
+            returns False on timeout, True otherwise;
+        """
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: not (self.queue or self.busy), timeout
+            )
+        # end with
+    # end def
+
+
+    def get_stats (self):
+        """
+            returns worker stats as a dict() with keys 'commands'
+            (run commands), 'dropped' (dropped commands), 'errors'
+            (failed commands), 'pending' (queued commands),
+            'wait_avg', 'wait_max' (queue latency in ms),
+            'run_avg' and 'run_max' (run time in ms);
+        """
+        with self.condition:
+            # inits
+            _stats = self.stats
+            _count = max(1, _stats["commands"])
+            return {
+                "commands": _stats["commands"],
+                "dropped": _stats["dropped"],
+                "errors": _stats["errors"],
+                "pending": len(self.queue),
+                "wait_avg": _stats["wait_total"] / _count,
+                "wait_max": _stats["wait_max"],
+                "run_avg": _stats["run_total"] / _count,
+                "run_max": _stats["run_max"],
+            }
+        # end with
+    # end def
+
+
+    def post (self, callback, *args):
+        """
+            enqueues @callback(*args) command without blocking;
+        """
+        with self.condition:
+            # queue is full?
+            if len(self.queue) >= self.queue_size:
+                self.queue.popleft()
+                self.stats["dropped"] += 1
+            # end if
+            self.queue.append((time.perf_counter(), callback, args))
+            # start worker thread
+            if not self.thread:
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+            # end if
+            self.condition.notify_all()
+        # end with
+    # end def
+
+# end class AudioCommandWorker
+
+
+class QueuedAudioPlayer (BaseAudioPlayer):
+    """
+        Audio player proxy;
+        forwards commands to @player through app-wide
+        AudioCommandWorker, so that audio calls never block
+        Tk mainloop;
+    """
+
+    def __init__ (self, player, worker=None):
+        """ Class initialiser """
+        # super class inits
+        super().__init__(player.volume)
+        # member inits
+        self.player = player
+        self.worker = worker or get_audio_worker()
+    # end def
+
+
+    def on_garbage_collection (self):
+        """
+            hook method to be reimplemented in subclass;
+        """
+        # stop playing (player will be collected by worker)
+        self.worker.post(self.player.stop)
+    # end def
+
+
+    def pause (self):
+        """
+            pauses audio data playback;
+        """
+        self.worker.post(self.player.pause)
+    # end def
+
+
+    def play (self, uri, volume=None):
+        """
+            plays audio data retrieved from @uri at @volume level;
+        """
+        self.worker.post(self.player.play, uri, volume)
+    # end def
+
+
+    def resume (self):
+        """
+            resumes audio data playback;
+        """
+        self.worker.post(self.player.resume)
+    # end def
+
+
+    def set_volume (self, volume):
+        """
+            sets volume of audio data playback;
+        """
+        self.volume = volume
+        self.worker.post(self.player.set_volume, volume)
+    # end def
+
+
+    def stop (self):
+        """
+            stops audio data playback;
+        """
+        self.worker.post(self.player.stop)
+    # end def
+
+# end class QueuedAudioPlayer
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    tkGAME - all-in-one Game library for Tkinter
+
+    Copyright (c) 2014+ Raphaël Seban <motus@laposte.net>
+
+    This program is free software: you can redistribute it and/or
+    modify it under the terms of the GNU General Public License as
+    published by the Free Software Foundation, either version 3 of
+    the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+    General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.
+
+    If not, see http://www.gnu.org/licenses/
+"""
+
+
+# private module member
+__culling_layer = None
+
+
+# app-wide unique instance getter
+def get_culling_layer (canvas):
+    """
+        retrieves app-wide unique instance of viewport culling layer;
+    """
+    global __culling_layer
+    if not isinstance(__culling_layer, TkGameCanvasCulling):
+        __culling_layer = TkGameCanvasCulling(canvas)
+    # end if
+    return __culling_layer
+# end def
+
+
+class TkGameCanvasCulling:
+    """
+        Viewport culling layer for matrix sprites (tkinter);
+        only sprites located in matrix cells around the current
+        canvas viewport own a canvas image item; off-screen sprites
+        keep on living (events, physics) without any canvas item
+        and with their looping image animations suspended;
+        released canvas items are recycled for sprites getting
+        into view;
+    """
+
+    # class constants
+    MARGIN = 2      # extra cells kept around viewport
+
+
+    def __init__ (self, canvas, margin=None):
+        """
+            class constructor
+        """
+        # member inits
+        self.canvas = canvas
+        self.margin = self.MARGIN if margin is None else margin
+        self.matrix = None
+        self.pinned = set()
+        self.visible = set()
+        self.free_ids = list()
+    # end def
+
+
+    def clear (self):
+        """
+            clears up sprites and recycled canvas items;
+            must be called once canvas contents have been deleted;
+        """
+        self.matrix = None
+        self.pinned.clear()
+        self.visible.clear()
+        self.free_ids.clear()
+    # end def
+
+
+    def hide_sprite (self, sprite):
+        """
+            hides @sprite and keeps its canvas item for recycling;
+        """
+        # release canvas item
+        _cid = sprite.hide()
+        # recyclable?
+        if _cid:
+            self.canvas.itemconfigure(_cid, state="hidden")
+            self.free_ids.append(_cid)
+        # end if
+    # end def
+
+
+    def reset (self, matrix, *pinned):
+        """
+            resets culling layer for a new @matrix of sprites;
+            @pinned sprites (e.g. player) will never be culled;
+            this must be called *BEFORE* starting sprites, so that
+            only visible ones get a canvas item at setup time;
+        """
+        # inits
+        self.clear()
+        self.matrix = matrix
+        self.pinned.update(pinned)
+        # all culled by default
+        for _sprite in matrix.objects():
+            if _sprite not in self.pinned:
+                _sprite.visible = False
+            # end if
+        # end for
+    # end def
+
+
+    def show_sprite (self, sprite):
+        """
+            shows @sprite using a recycled canvas item, if any;
+        """
+        # inits
+        _cid = self.free_ids.pop() if self.free_ids else 0
+        # show sprite
+        sprite.show(_cid)
+        # canvas item not used (sprite already shown or locked)?
+        if _cid and sprite.canvas_id != _cid:
+            self.free_ids.append(_cid)
+        # end if
+        # keep pinned sprites on top of newly shown items
+        if sprite.canvas_id:
+            for _pinned in self.pinned:
+                if _pinned.canvas_id:
+                    self.canvas.tag_lower(
+                        sprite.canvas_id, _pinned.canvas_id
+                    )
+                # end if
+            # end for
+        # end if
+    # end def
+
+
+    def update (self, *args, **kw):
+        """
+            generic event handler;
+            shows sprites around canvas viewport and hides others;
+        """
+        # no matrix?
+        if not self.matrix:
+            # trap out!
+            return
+        # end if
+        # inits
+        _matrix = self.matrix
+        _at = _matrix.at
+        _width = self.canvas.winfo_width()
+        _height = self.canvas.winfo_height()
+        # not mapped yet?
+        if _width < 2 or _height < 2:
+            _width = self.canvas.winfo_reqwidth()
+            _height = self.canvas.winfo_reqheight()
+        # end if
+        x0, y0 = self.canvas.canvasx(0), self.canvas.canvasy(0)
+        row0, col0 = _matrix.row_column((x0, y0))
+        row1, col1 = _matrix.row_column((x0 + _width, y0 + _height))
+        row0 = int(max(0, row0 - self.margin))
+        col0 = int(max(0, col0 - self.margin))
+        row1 = int(min(_matrix.rows - 1, row1 + self.margin))
+        col1 = int(min(_matrix.columns - 1, col1 + self.margin))
+        # collect sprites around viewport
+        _visible = set()
+        for _row in range(row0, row1 + 1):
+            for _column in range(col0, col1 + 1):
+                _sprite = _at((_row, _column))
+                if _sprite is not None:
+                    _visible.add(_sprite)
+                # end if
+            # end for
+        # end for
+        _visible -= self.pinned
+        # hide sprites out of view
+        for _sprite in self.visible - _visible:
+            self.hide_sprite(_sprite)
+        # end for
+        # show sprites getting into view
+        for _sprite in _visible - self.visible:
+            self.show_sprite(_sprite)
+        # end for
+        # update visible set
+        self.visible = _visible
+    # end def
+
+# end class TkGameCanvasCulling
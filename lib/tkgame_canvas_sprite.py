@@ -24,6 +24,7 @@
 
 # lib imports
 import os.path as OP
+import sys
 
 # mandatory dependencies
 from . import tkgame_events as EM
@@ -40,6 +41,10 @@ class TkGameCanvasSprite:
     # class constants
     EVENTS_GROUP = "Game"
 
+    # app-wide cache of notified signal names
+    # {(class, role, action): (general, specific)}
+    event_signals = dict()
+
     STATUS = {
         "default": {
             "loop": False,
@@ -60,9 +65,11 @@ class TkGameCanvasSprite:
         self.animations = AP.get_animation_pool()
         self.image_manager = IM.get_image_manager()
         self.images_dir = kw.get("images_dir") or ""
+        self.frames = dict()
         self.role = kw.get("role") or ""
         self.locked = False
         self.started = False
+        self.visible = True
         self.__state = None
         self.state = kw.get("state") or "default"
         self.canvas_id = kw.get("cid") or 0
@@ -149,6 +156,26 @@ class TkGameCanvasSprite:
     # end def
 
 
+    def get_event_signals (self, action):
+        """
+            returns (general, specific) tuple of signal names to be
+            notified along @action for this sprite class and role;
+            interned names are computed once and then kept in cache;
+        """
+        # inits
+        _key = (self.__class__, self.role, action)
+        _signals = self.event_signals.get(_key)
+        # not already done?
+        if _signals is None:
+            _signals = self.event_signals[_key] = (
+                sys.intern("Canvas:Sprite:{}".format(action)),
+                sys.intern(self.get_event_name(action)),
+            )
+        # end if
+        return _signals
+    # end def
+
+
     def get_sprites_from_ids (self, list_ids, exclude=None):
         """
             retrieves registered sprites in owner's dict along with
@@ -161,6 +188,34 @@ class TkGameCanvasSprite:
     # end def
 
 
+    def hide (self):
+        """
+            hides sprite when out of viewport (culling);
+            looping image animations get suspended until
+            self.show() is called;
+            returns released canvas item id for recycling (or 0);
+        """
+        # inits
+        _cid = 0
+        # not already hidden?
+        if self.visible:
+            # sprite is now hidden
+            self.visible = False
+            # suspend looping animation
+            # one-shot sequences must reach on_sequence_end()
+            if self.STATUS[self.state].get("loop"):
+                self.animations.stop(self.image_animation_loop)
+            # end if
+            # release canvas item
+            if not self.locked:
+                _cid = self.canvas_id
+            # end if
+            self.canvas_id = 0
+        # end if
+        return _cid
+    # end def
+
+
     def image_animation_loop (self):
         """
             sprite's image animation loop;
@@ -171,17 +226,18 @@ class TkGameCanvasSprite:
         # end if
         # inits
         _status = self.STATUS[self.state]
-        _image = self.image_manager.get_image(
-            OP.abspath(
-                OP.join(
-                    self.images_dir,
-                    "{}_{}.gif".format(self.state, self.state_counter)
-                )
-            )
-        )
-        if _image:
+        # suspended while out of viewport?
+        if not self.visible and _status.get("loop"):
+            return
+        # end if
+        _frames = self.frames.get(self.state, ())
+        # frame available?
+        if self.state_counter < len(_frames):
+            _image = _frames[self.state_counter]
             # update image
-            self.canvas.itemconfigure(self.canvas_id, image=_image)
+            if self.canvas_id:
+                self.canvas.itemconfigure(self.canvas_id, image=_image)
+            # end if
             if _status.get("sequence"):
                 # next step
                 self.state_counter += 1
@@ -237,8 +293,12 @@ class TkGameCanvasSprite:
     def load_images (self):
         """
             cacheing all sprite states pictures;
+            builds indexed frames table for each state;
         """
         self.image_manager.load_images(self.images_dir)
+        self.frames = self.image_manager.get_frames(
+            self.images_dir, self.STATUS
+        )
     # end def
 
 
@@ -274,7 +334,9 @@ class TkGameCanvasSprite:
         # but you can reimplement this in your own subclasses
         dx, dy = c_dict["dx"], c_dict["dy"]
         # relative move on canvas
-        self.canvas.move(self.canvas_id, dx, dy)
+        if self.canvas_id:
+            self.canvas.move(self.canvas_id, dx, dy)
+        # end if
         # update pos
         self.x += dx
         self.y += dy
@@ -319,15 +381,14 @@ class TkGameCanvasSprite:
         """
             hook method to be reimplemented in subclass;
             notifies application of some general and specific actions;
+            signals without any connected slot are skipped;
         """
-        # general notification
-        self.events.raise_event(
-            "Canvas:Sprite:{}".format(action), sprite=self
-        )
-        # specific notification
-        self.events.raise_event(
-            self.get_event_name(action), sprite=self
-        )
+        # general and specific notifications
+        for _signal in self.get_event_signals(action):
+            if self.events.has_slots(_signal):
+                self.events.raise_event(_signal, sprite=self)
+            # end if
+        # end for
     # end def
 
 
@@ -356,12 +417,14 @@ class TkGameCanvasSprite:
         """
         # sets up sprite if not already done
         if not self.canvas_id:
-            # create sprite on canvas
-            self.canvas_id = self.canvas.create_image(
-                self.x, self.y,
-                anchor="center",
-                tags=self.canvas_tags,
-            )
+            # create sprite on canvas (unless culled)
+            if self.visible:
+                self.canvas_id = self.canvas.create_image(
+                    self.x, self.y,
+                    anchor="center",
+                    tags=self.canvas_tags,
+                )
+            # end if
             # load sprite's animation pictures
             self.load_images()
             # notify sprite's creation (e.g. for registration)
@@ -370,6 +433,51 @@ class TkGameCanvasSprite:
     # end def
 
 
+    def show (self, canvas_id=0):
+        """
+            shows sprite again once back into viewport (culling);
+            recycles @canvas_id canvas item, if any, or creates a
+            new one otherwise; shows current frame at once and
+            resumes looping image animations (one-shot sequences
+            keep running while hidden, see self.hide());
+        """
+        # not already shown?
+        if not self.visible and not self.locked:
+            # sprite is now visible
+            self.visible = True
+            # current frame (last one for ended sequences)
+            _frames = self.frames.get(self.state, ())
+            _image = (
+                _frames[min(self.state_counter, len(_frames) - 1)]
+                if _frames else None
+            )
+            # recycle canvas item
+            if canvas_id:
+                self.canvas.coords(canvas_id, self.x, self.y)
+                self.canvas.itemconfigure(
+                    canvas_id,
+                    state="normal",
+                    image=_image,
+                    tags=self.canvas_tags,
+                )
+                self.canvas_id = canvas_id
+            # create new one
+            else:
+                self.canvas_id = self.canvas.create_image(
+                    self.x, self.y,
+                    anchor="center",
+                    image=_image,
+                    tags=self.canvas_tags,
+                )
+            # end if
+            # resume suspended animation loop
+            if self.STATUS[self.state].get("loop"):
+                self.update_image_animation_loop()
+            # end if
+        # end if
+    # end def
+
+
     @property
     def sprite_name (self):
         """
@@ -22,6 +22,12 @@
     If not, see http://www.gnu.org/licenses/
 """
 
+# lib imports
+import collections
+import time
+import weakref
+
+
 # module private member
 __event_manager = None
 
@@ -42,30 +48,294 @@ def get_event_manager ():
 class TkGameEventManager:
     """
         simplified signal/slot universal event manager;
+        slots are kept in a set per signal name and compiled into
+        an immutable tuple of slots, so that raise_event() only has
+        to iterate over this tuple;
+        signal names are made of colon-separated segments (e.g.
+        'Game:Rock:Moved') and are indexed by segment prefixes
+        (e.g. 'Game:', 'Game:Rock:') for group disconnections;
+        a '*' segment in a connected signal name matches any single
+        segment (e.g. 'Game:*:Destroyed');
+        an optional tracer records per-signal stats and recent
+        events (see start_tracing());
+        in queued mode, signals declared with defer_events() are
+        posted to a queue instead and dispatched later on, once
+        per game tick, by drain_events(); coalescible signals are
+        then merged into one single queued event;
     """
 
+    # class constants
+    SEPARATOR = ":"
+    WILDCARD = "*"
+
+    TRACE_SIZE = 1000       # recent events kept while tracing
+
+
     def __init__ (self):
         """
             class constructor
         """
         # member inits
         self.connections = dict()
+        self.dispatch = dict()
+        self.groups = dict()
+        self.patterns = set()
+        self.dead_signals = set()
+        self.queued = False
+        self.queue = list()
+        self.deferred = dict()
+        self.pending = dict()
+        self.coalesced = 0
+        # tracing inits (disabled by default)
+        self.tracing = False
+        self.trace = dict()
+        self.trace_events = collections.deque(maxlen=self.TRACE_SIZE)
+        self.trace_start = 0.0
+    # end def
+
+
+    def _add_signal (self, signal):
+        """
+            registers a new @signal name in connections and in
+            group and pattern indexes;
+        """
+        # inits
+        self.connections[signal] = set()
+        # index by segment prefixes
+        for _prefix in self._prefixes(signal):
+            self.groups.setdefault(_prefix, set()).add(signal)
+        # end for
+        # wildcard pattern?
+        if self.WILDCARD in str(signal).split(self.SEPARATOR):
+            self.patterns.add(signal)
+        # end if
+    # end def
+
+
+    def _compile (self, signal):
+        """
+            returns compiled tuple of slots for @signal name,
+            including slots of matching wildcard patterns;
+            keeps result in cache until next (dis)connection;
+        """
+        # inits
+        _slots = set(self.connections.get(signal) or ())
+        # look for matching patterns
+        if self.patterns:
+            _segments = str(signal).split(self.SEPARATOR)
+            for _pattern in self.patterns:
+                if self._matches(_pattern, _segments):
+                    _slots.update(self.connections[_pattern])
+                # end if
+            # end for
+        # end if
+        _slots = self.dispatch[signal] = tuple(_slots)
+        return _slots
+    # end def
+
+
+    def _drop_dead_slots (self):
+        """
+            removes collected weak slots from their signal names;
+            this is not done in weak references callbacks as they
+            may occur at any time during garbage collection;
+        """
+        # inits
+        _signals, self.dead_signals = self.dead_signals, set()
+        # browse signals
+        for _signal in _signals:
+            _slots = self.connections.get(_signal)
+            # signal does exist?
+            if _slots:
+                _slots.difference_update(
+                    [_slot for _slot in _slots if not _slot]
+                )
+                self._invalidate(_signal)
+            # end if
+        # end for
+    # end def
+
+
+    def _get_slots (self, signal):
+        """
+            protected method - returns current tuple of slots for
+            @signal name, compiling it if needed;
+        """
+        _slots = self.dispatch.get(signal)
+        if _slots is None:
+            _slots = self._compile(signal)
+        # end if
+        return _slots
     # end def
 
 
-    def connect (self, signal, *slots):
+    def _invalidate (self, signal):
+        """
+            drops compiled tuples of slots depending on @signal;
+        """
+        # wildcard pattern?
+        if signal in self.patterns:
+            self.dispatch.clear()
+        else:
+            self.dispatch.pop(signal, None)
+        # end if
+    # end def
+
+
+    def _matches (self, pattern, segments):
+        """
+            determines if @pattern wildcard signal name matches
+            signal name split into @segments;
+        """
+        # inits
+        _pattern = str(pattern).split(self.SEPARATOR)
+        # same number of segments?
+        if len(_pattern) != len(segments):
+            return False
+        # end if
+        # compare segments
+        for _p, _s in zip(_pattern, segments):
+            if _p != self.WILDCARD and _p != _s:
+                return False
+            # end if
+        # end for
+        return True
+    # end def
+
+
+    def _prefixes (self, signal):
+        """
+            returns list of segment prefixes for @signal name
+            e.g. ['Game:', 'Game:Rock:'] for 'Game:Rock:Moved';
+        """
+        # inits
+        _segments = str(signal).split(self.SEPARATOR)
+        return [
+            self.SEPARATOR.join(_segments[:i]) + self.SEPARATOR
+            for i in range(1, len(_segments))
+        ]
+    # end def
+
+
+    def _remove_signal (self, signal):
+        """
+            removes @signal name from connections and from group
+            and pattern indexes;
+        """
+        # signal does exist?
+        if signal in self.connections:
+            # drop compiled tuples
+            self._invalidate(signal)
+            del self.connections[signal]
+            self.patterns.discard(signal)
+            # update group index
+            for _prefix in self._prefixes(signal):
+                _group = self.groups.get(_prefix)
+                if _group is not None:
+                    _group.discard(signal)
+                    if not _group:
+                        del self.groups[_prefix]
+                    # end if
+                # end if
+            # end for
+        # end if
+    # end def
+
+
+    def _trace_raise_event (self, signal, *args, **kw):
+        """
+            protected method - raise_event() replacement while
+            tracing (see start_tracing());
+        """
+        # deferred signal?
+        if self.queued and signal in self.deferred:
+            return self.post_event(signal, *args, **kw)
+        # end if
+        # call slots
+        _slots = self._get_slots(signal)
+        self._trace_slots(signal, _slots, args, kw)
+        return bool(_slots)
+    # end def
+
+
+    def _trace_slots (self, signal, slots, args, kw):
+        """
+            protected method - calls @slots for @signal name and
+            records stats and recent event (times in milliseconds);
+        """
+        # inits
+        _entry = self.trace.get(signal)
+        if _entry is None:
+            _entry = self.trace[signal] = {
+                "raised": 0, "slots": 0,
+                "time_total": 0.0, "time_max": 0.0,
+            }
+        # end if
+        _start = time.perf_counter() * 1000
+        # call slots
+        try:
+            for _slot in slots:
+                _slot(*args, **kw)
+            # end for
+        finally:
+            _time = time.perf_counter() * 1000 - _start
+            _entry["raised"] += 1
+            _entry["slots"] += len(slots)
+            _entry["time_total"] += _time
+            _entry["time_max"] = max(_entry["time_max"], _time)
+            self.trace_events.append(
+                (_start - self.trace_start, signal, len(slots), _time)
+            )
+        # end try
+    # end def
+
+
+    def clear_queue (self):
+        """
+            drops all queued events;
+        """
+        self.queue.clear()
+        self.pending.clear()
+    # end def
+
+
+    def connect (self, signal, *slots, weak=False):
         """
             connects signal name to multiple callback slots;
+            if @weak is True, bound method slots are weakly
+            referenced and get automatically disconnected once
+            their instance is garbage collected;
             returns True on success, False otherwise;
         """
+        # clean up collected slots
+        if self.dead_signals:
+            self._drop_dead_slots()
+        # end if
+        # new signal?
+        if signal not in self.connections:
+            self._add_signal(signal)
+        # end if
         # get signal current set of slots
-        _slots = self.connections.setdefault(signal, set())
+        _slots = self.connections[signal]
         # signal do have a set of slots
         if isinstance(_slots, set):
+            # weak references
+            if weak:
+                slots = (
+                    TkGameWeakSlot(
+                        _slot,
+                        lambda ref, signal=signal:
+                            self.dead_signals.add(signal)
+                    ) if hasattr(_slot, "__self__") else _slot
+                    for _slot in slots
+                )
+            # end if
             # slots must be unique for each signal
             _slots.update(set(slots))
             # update signal set of slots
             self.connections[signal] = set(filter(callable, _slots))
+            # drop compiled tuples
+            self._invalidate(signal)
             # operation succeeded
             return True
         # end if
@@ -74,10 +344,11 @@ class TkGameEventManager:
     # end def
 
 
-    def connect_dict (self, events_dict):
+    def connect_dict (self, events_dict, weak=False):
         """
             connects (signal, slots) pairs in dict() object;
             slots can be a single callback or one of tuple, list, set;
+            see connect() for @weak;
             returns True on success, False otherwise;
         """
         # param controls
@@ -85,9 +356,9 @@ class TkGameEventManager:
             # loop on items
             for (_signal, _slots) in events_dict.items():
                 if isinstance(_slots, (tuple, list, set)):
-                    self.connect(_signal, *_slots)
+                    self.connect(_signal, *_slots, weak=weak)
                 else:
-                    self.connect(_signal, _slots)
+                    self.connect(_signal, _slots, weak=weak)
                 # end if
             # end for
             # operation succeeded
@@ -101,11 +372,28 @@ class TkGameEventManager:
     # end def
 
 
+    def defer_events (self, *signals, coalesce=False):
+        """
+            declares signal names to be queued in queued mode;
+            several queued events of a @coalesce signal are merged
+            into one, keeping the last arguments and keywords;
+        """
+        # browse signals
+        for _signal in signals:
+            self.deferred[_signal] = bool(coalesce)
+        # end for
+    # end def
+
+
     def disconnect (self, signal, *slots):
         """
             disconnects list of callback slots from signal name;
             returns True if signal exists, False otherwise;
         """
+        # clean up collected slots
+        if self.dead_signals:
+            self._drop_dead_slots()
+        # end if
         # get signal current set of slots
         _slots = self.connections.get(signal)
         # signal does exist and has a set of slots
@@ -114,6 +402,8 @@ class TkGameEventManager:
             _slots.difference_update(set(slots))
             # update signal set of slots
             self.connections[signal] = set(filter(callable, _slots))
+            # drop compiled tuples
+            self._invalidate(signal)
             # operation succeeded
             return True
         # end if
@@ -131,12 +421,15 @@ class TkGameEventManager:
         # asked for all clear?
         if not signals:
             self.connections.clear()
+            self.dispatch.clear()
+            self.groups.clear()
+            self.patterns.clear()
         # listed clean-up
         else:
             # browse signals list
             for _signal in set(signals):
                 # signal is no longer useful
-                self.connections.pop(_signal, None)
+                self._remove_signal(_signal)
             # end for
         # end if
     # end def
@@ -173,15 +466,156 @@ class TkGameEventManager:
         """
             disconnects only signals which name starts with @groupname;
             for each signal, all slots are removed at once;
+            segment prefixes (e.g. 'Game:') are looked up in group
+            index, other group names need a full scan;
         """
+        # indexed group?
+        if groupname in self.groups:
+            _signals = set(self.groups[groupname])
+        # full scan
+        else:
+            _signals = [
+                _signal for _signal in self.connections
+                if str(_signal).startswith(groupname)
+            ]
+        # end if
         # browse signals list
-        for _signal in set(self.connections):
-            # signal in group?
-            if str(_signal).startswith(groupname):
-                # disconnect signal
-                self.connections.pop(_signal, None)
+        for _signal in _signals:
+            # disconnect signal
+            self._remove_signal(_signal)
+        # end for
+    # end def
+
+
+    def drain_events (self):
+        """
+            dispatches all queued events in posting order;
+            events posted meanwhile are kept for next drain;
+            returns number of dispatched events;
+        """
+        # inits
+        _queue = self.queue
+        self.queue = list()
+        self.pending.clear()
+        # browse queue
+        for _signal, _args, _kw in _queue:
+            # inits
+            _slots = self._get_slots(_signal)
+            # tracing?
+            if self.tracing:
+                self._trace_slots(_signal, _slots, _args, _kw)
+            else:
+                for _slot in _slots:
+                    _slot(*_args, **_kw)
+                # end for
             # end if
         # end for
+        return len(_queue)
+    # end def
+
+
+    def dump_trace (self, file_path=None):
+        """
+            writes tracing stats as a text table sorted by total
+            time spent in slots, followed by recent events, either
+            appending to @file_path or printing to stdout if omitted;
+        """
+        # inits
+        _lines = [
+            "{:<48} {:>9} {:>9} {:>10} {:>10}".format(
+                "signal", "raised", "slots", "time tot", "time max"
+            )
+        ]
+        _stats = sorted(
+            self.get_trace().items(),
+            key=lambda item: item[1]["time_total"],
+            reverse=True,
+        )
+        # browse stats
+        for _signal, _entry in _stats:
+            _lines.append(
+                "{:<48} {:>9} {:>9} {:>10.2f} {:>10.2f}".format(
+                    str(_signal)[-48:], _entry["raised"],
+                    _entry["slots"], _entry["time_total"],
+                    _entry["time_max"],
+                )
+            )
+        # end for
+        _lines.append("")
+        _lines.append(
+            "{:>12} {:<48} {:>9} {:>10}".format(
+                "at (ms)", "recent events", "slots", "time"
+            )
+        )
+        # browse recent events
+        for _at, _signal, _slots, _time in list(self.trace_events):
+            _lines.append(
+                "{:>12.2f} {:<48} {:>9} {:>10.3f}".format(
+                    _at, str(_signal)[-48:], _slots, _time
+                )
+            )
+        # end for
+        _text = "\n".join(_lines) + "\n"
+        # output
+        if file_path:
+            with open(file_path, "a") as file_out:
+                file_out.write(_text + "\n")
+            # end with
+        else:
+            print(_text)
+        # end if
+    # end def
+
+
+    def get_trace (self):
+        """
+            returns a snapshot of tracing stats as a dict() of
+            signal names with dict() values: 'raised': number of
+            dispatches, 'slots': number of slots run, 'time_total',
+            'time_max': time spent in slots (in milliseconds,
+            including nested events);
+        """
+        return {
+            _signal: _entry.copy()
+            for _signal, _entry in self.trace.items()
+        }
+    # end def
+
+
+    def has_slots (self, signal):
+        """
+            returns True if at least one slot is connected to
+            @signal name, False otherwise;
+        """
+        # inits
+        _slots = self.dispatch.get(signal)
+        if _slots is None:
+            _slots = self._compile(signal)
+        # end if
+        return bool(_slots)
+    # end def
+
+
+    def post_event (self, signal, *args, **kw):
+        """
+            queues signal name with eventual arguments and keywords
+            for next drain_events() call; merges it with an already
+            queued event for coalescible signals;
+            returns True;
+        """
+        # already queued coalescible event?
+        _index = self.pending.get(signal)
+        if _index is not None:
+            self.queue[_index] = (signal, args, kw)
+            self.coalesced += 1
+        # new queued event
+        else:
+            if self.deferred.get(signal):
+                self.pending[signal] = len(self.queue)
+            # end if
+            self.queue.append((signal, args, kw))
+        # end if
+        return True
     # end def
 
 
@@ -189,18 +623,24 @@ class TkGameEventManager:
         """
             calls all attached slots to the given signal name  with
             eventual arguments and keywords;
+            deferred signals get queued in queued mode;
             returns True if signal exists, False otherwise;
         """
-        # get signal current set of slots
-        _slots = self.connections.get(signal)
-        # signal do exist and has a set of slots
-        if _slots and isinstance(_slots, set):
-            # keep only callable slots
-            _slots = set(filter(callable, _slots))
-            # update signal slots collection
-            self.connections[signal] = _slots
-            # browse the set
-            for _slot in _slots.copy():
+        # deferred signal?
+        if self.queued and signal in self.deferred:
+            return self.post_event(signal, *args, **kw)
+        # end if
+        # get signal current tuple of slots
+        # (inlined for speed, see _get_slots())
+        _slots = self.dispatch.get(signal)
+        if _slots is None:
+            _slots = self._compile(signal)
+        # end if
+        # signal do exist and has slots
+        if _slots:
+            # browse the tuple
+            # (slots (dis)connected meanwhile will not change it)
+            for _slot in _slots:
                 # call each slot one by one
                 # with arguments and keywords
                 _slot(*args, **kw)
@@ -212,4 +652,115 @@ class TkGameEventManager:
         return False
     # end def
 
+
+    def set_queued (self, enabled=True):
+        """
+            enables or disables queued mode; pending events get
+            dispatched when disabling;
+        """
+        self.queued = bool(enabled)
+        if not self.queued:
+            self.drain_events()
+        # end if
+    # end def
+
+
+    def start_tracing (self, size=None):
+        """
+            enables event tracing; stats are cleared up;
+            @size sets number of recent events kept in ring buffer
+            (defaults to self.TRACE_SIZE);
+            raise_event() gets replaced by a tracing version, so
+            that tracing costs nothing when disabled;
+        """
+        # inits
+        self.trace.clear()
+        self.trace_events = collections.deque(
+            maxlen=max(1, int(size or self.TRACE_SIZE))
+        )
+        self.trace_start = time.perf_counter() * 1000
+        self.tracing = True
+        self.raise_event = self._trace_raise_event
+    # end def
+
+
+    def stop_tracing (self):
+        """
+            disables event tracing;
+            collected stats remain available (see get_trace());
+        """
+        # inits
+        self.tracing = False
+        # restore raise_event()
+        self.__dict__.pop("raise_event", None)
+    # end def
+
 # end class TkGameEventManager
+
+
+class TkGameWeakSlot:
+    """
+        weakly referenced bound method slot;
+        compares and hashes as its bound method, so that it may
+        be disconnected with the bound method itself;
+        evaluates to False once its instance has been collected;
+    """
+
+    __slots__ = ("method", "hash")
+
+
+    def __init__ (self, method, callback=None):
+        """
+            class constructor;
+            @callback is called with weak reference once @method
+            instance has been garbage collected;
+        """
+        # member inits
+        self.method = weakref.WeakMethod(method, callback)
+        self.hash = hash(method)
+    # end def
+
+
+    def __bool__ (self):
+        """
+            True while bound method instance is alive;
+        """
+        return self.method() is not None
+    # end def
+
+
+    def __call__ (self, *args, **kw):
+        """
+            calls bound method, if still alive;
+        """
+        # inits
+        _method = self.method()
+        # still alive?
+        if _method is not None:
+            return _method(*args, **kw)
+        # end if
+    # end def
+
+
+    def __eq__ (self, other):
+        """
+            compares as bound method;
+        """
+        # weak slot?
+        if isinstance(other, TkGameWeakSlot):
+            other = other.method()
+        # end if
+        # inits
+        _method = self.method()
+        return _method is not None and _method == other
+    # end def
+
+
+    def __hash__ (self):
+        """
+            hashes as bound method;
+        """
+        return self.hash
+    # end def
+
+# end class TkGameWeakSlot
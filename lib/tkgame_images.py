@@ -23,9 +23,19 @@
 """
 
 # lib imports
+import collections
+import hashlib
+import json
 import os
 import os.path as OP
-from tkinter import PhotoImage
+import time
+import weakref
+from tkinter import PhotoImage, TclError
+
+
+# sprite-sheet atlas file names (see tools/build_atlas.py)
+ATLAS_IMAGE = "atlas.png"
+ATLAS_INDEX = "atlas.json"
 
 
 # module private member
@@ -47,16 +57,144 @@ def get_image_manager ():
 
 class TkGameImageManager:
     """
-        A tkinter.PhotoImage() images manager
+        A tkinter.PhotoImage() images manager;
+        image directories holding a sprite-sheet atlas get their
+        frames sliced from one single atlas image instead of
+        loading one image file per frame;
+        identical images (same content hash) share one single
+        PhotoImage, whatever their file path;
+        cache is bounded by a pixel budget: least recently used
+        image directories get evicted first, except pinned ones
+        (see self.pin_dirs());
     """
 
-    def __init__ (self):
+    # class constants
+    PRELOAD_SLICE = 8       # preloading time slice in milliseconds
+    PIXEL_BUDGET = 4 * 1024 * 1024  # cache budget in pixels (0: no limit)
+
+
+    def __init__ (self, pixel_budget=None):
         """
             class constructor
         """
         # member inits
         self.images = dict()
-        self.loaded_dirs = list()
+        self.hashes = weakref.WeakValueDictionary()
+        self.dir_files = dict()
+        self.loaded_dirs = collections.OrderedDict()
+        self.pinned_dirs = set()
+        self.frames = dict()
+        self.evictions = 0
+        self.pixel_budget = (
+            self.PIXEL_BUDGET if pixel_budget is None else pixel_budget
+        )
+    # end def
+
+
+    def _evict_dir (self, images_dir):
+        """
+            drops @images_dir images and frames tables from cache;
+            shared images remain alive as long as someone else
+            keeps a reference on them;
+        """
+        for _file in self.dir_files.pop(images_dir, ()):
+            self.images.pop(_file, None)
+        # end for
+        self.frames.pop(images_dir, None)
+        self.loaded_dirs.pop(images_dir, None)
+        self.evictions += 1
+    # end def
+
+
+    def _register_image (self, file_path, image):
+        """
+            registers @image in cache for @file_path;
+        """
+        self.images[file_path] = image
+        self.dir_files.setdefault(OP.dirname(file_path), set()).add(file_path)
+    # end def
+
+
+    def _touch_dir (self, images_dir):
+        """
+            marks @images_dir as most recently used, if loaded;
+        """
+        if images_dir in self.loaded_dirs:
+            self.loaded_dirs.move_to_end(images_dir)
+        # end if
+    # end def
+
+
+    def get_frames (self, images_dir, states):
+        """
+            returns a {state: (frame_0, frame_1, ...)} table of
+            PhotoImage frames for @images_dir along @states names;
+            frames are looked up once per directory and state from
+            '{state}_{index}.gif' files, previously loaded with
+            self.load_images(); table is then kept in cache, once
+            @images_dir has been fully loaded (an evicted or partly
+            loaded directory must not leave empty frames behind);
+        """
+        # inits
+        images_dir = OP.abspath(OP.expanduser(images_dir))
+        if images_dir in self.loaded_dirs:
+            _table = self.frames.setdefault(images_dir, dict())
+            self._touch_dir(images_dir)
+        else:
+            _table = dict()
+        # end if
+        # browse states
+        for _state in states:
+            # not already done?
+            if _state not in _table:
+                # inits
+                _frames = []
+                # collect contiguous frames
+                while True:
+                    _image = self.images.get(
+                        OP.join(
+                            images_dir,
+                            "{}_{}.gif".format(_state, len(_frames))
+                        )
+                    )
+                    if not _image:
+                        break
+                    # end if
+                    _frames.append(_image)
+                # end while
+                _table[_state] = tuple(_frames)
+            # end if
+        # end for
+        return _table
+    # end def
+
+
+    def get_stats (self):
+        """
+            returns images cache stats as a dict() with keys
+            'entries' (number of cached file paths), 'unique'
+            (number of distinct PhotoImage objects), 'pixels'
+            (pixels held by distinct images), 'bytes' (estimated
+            pixel memory at 32 bits per pixel), 'dirs' (number of
+            loaded directories), 'pinned' (number of pinned
+            directories), 'evictions' (number of evicted
+            directories so far) and 'budget' (pixel budget);
+        """
+        # inits
+        _unique = {id(_image): _image for _image in self.images.values()}
+        _pixels = sum(
+            _image.width() * _image.height() for _image in _unique.values()
+        )
+        return {
+            "entries": len(self.images),
+            "unique": len(_unique),
+            "pixels": _pixels,
+            "bytes": _pixels * 4,
+            "dirs": len(self.loaded_dirs),
+            "pinned": len(self.pinned_dirs),
+            "evictions": self.evictions,
+            "budget": self.pixel_budget,
+        }
     # end def
 
 
@@ -77,18 +215,74 @@ class TkGameImageManager:
     # end def
 
 
-    def load_images (self, images_dir, **kw):
+    def load_atlas (self, images_dir):
         """
-            loads images from directory if not previously done;
-            optional keywords may be:
-            'filter_callback': filters image file path to
-                determine if it should be taken or not; will look
-                for GIF image files if omitted;
-            'recursive': boolean to browse images_dir recursively;
-                no recursion by default, if omitted;
+            slices frames from @images_dir sprite-sheet atlas, if
+            any; frames are registered as if loaded from their
+            original image files;
+            returns number of sliced frames (at least 1) on
+            success, 0 otherwise;
+        """
+        # inits
+        _index_path = OP.join(images_dir, ATLAS_INDEX)
+        _count = 0
+        # no atlas?
+        if not OP.isfile(_index_path):
+            return 0
+        # end if
+        try:
+            with open(_index_path) as file_in:
+                _index = json.load(file_in)
+            # end with
+            _atlas = PhotoImage(
+                file=OP.join(images_dir, _index.get("image") or ATLAS_IMAGE)
+            )
+        except (OSError, ValueError, TclError):
+            return 0
+        # end try
+        # slice frames
+        for _name, (x, y, w, h, *_hash) in _index["frames"].items():
+            _file = OP.join(images_dir, _name)
+            if _file not in self.images:
+                # identical frame already sliced?
+                _key = "rgba:{}".format(_hash[0]) if _hash else None
+                _frame = self.hashes.get(_key)
+                if _frame is None:
+                    _frame = PhotoImage(width=w, height=h)
+                    _frame.tk.call(
+                        _frame, "copy", _atlas,
+                        "-from", x, y, x + w, y + h
+                    )
+                    if _key:
+                        self.hashes[_key] = _frame
+                    # end if
+                    _count += 1
+                # end if
+                self._register_image(_file, _frame)
+            # end if
+        # end for
+        return max(1, _count)
+    # end def
+
+
+    def iter_load_images (self, images_dir, **kw):
+        """
+            generator version of self.load_images(), see there;
+            yields number of decoded images after each image file
+            (or after whole sprite-sheet atlas);
         """
         # inits
         images_dir = OP.abspath(OP.expanduser(images_dir))
+        self._touch_dir(images_dir)
+        # sprite-sheet atlas
+        if images_dir not in self.loaded_dirs and not kw:
+            _count = self.load_atlas(images_dir)
+            if _count:
+                self.loaded_dirs[images_dir] = True
+                self.trim_cache()
+                yield _count
+            # end if
+        # end if
         # not already done?
         if images_dir not in self.loaded_dirs:
             # callback inits
@@ -100,19 +294,126 @@ class TkGameImageManager:
                 if _file not in self.images:
                     if OP.isdir(_file):
                         if kw.get("recursive"):
-                            self.load_images(_file, **kw)
+                            yield from self.iter_load_images(_file, **kw)
                         # end if
                     elif filter_cb(_file):
-                        self.images[_file] = PhotoImage(file=_file)
+                        yield self.load_image_file(_file)
                     # end if
                 # end if
             # end for
             # directory has been loaded OK
-            self.loaded_dirs.append(images_dir)
+            # (may have been completed meanwhile)
+            if images_dir not in self.loaded_dirs:
+                self.loaded_dirs[images_dir] = True
+                self.trim_cache()
+            # end if
         # end if
     # end def
 
 
+    def load_image_file (self, file_path):
+        """
+            loads image from @file_path, sharing any already loaded
+            PhotoImage with same file contents;
+            returns number of decoded images (0 or 1);
+        """
+        # inits
+        with open(file_path, "rb") as file_in:
+            _key = "file:{}".format(hashlib.sha1(file_in.read()).hexdigest())
+        # end with
+        _image = self.hashes.get(_key)
+        _count = 0
+        # not already decoded?
+        if _image is None:
+            _image = self.hashes[_key] = PhotoImage(file=file_path)
+            _count = 1
+        # end if
+        self._register_image(file_path, _image)
+        return _count
+    # end def
+
+
+    def load_images (self, images_dir, **kw):
+        """
+            loads images from directory if not previously done;
+            optional keywords may be:
+            'filter_callback': filters image file path to
+                determine if it should be taken or not; will look
+                for GIF image files if omitted;
+            'recursive': boolean to browse images_dir recursively;
+                no recursion by default, if omitted;
+            a sprite-sheet atlas is used instead of image files
+            when available and without any of these keywords;
+        """
+        # load all at once
+        for _count in self.iter_load_images(images_dir, **kw):
+            pass
+        # end for
+    # end def
+
+
+    def pin_dirs (self, images_dirs):
+        """
+            pins @images_dirs list of image directories (e.g. those
+            needed by current game level) so that they never get
+            evicted from cache; previously pinned directories get
+            unpinned;
+        """
+        self.pinned_dirs = set(
+            OP.abspath(OP.expanduser(_dir)) for _dir in images_dirs
+        )
+        self.trim_cache()
+    # end def
+
+
+    def preload_images (self, images_dirs, widget, callback=None, **kw):
+        """
+            decodes images from @images_dirs list in small slices
+            run from @widget's idle loop, so that decoding never
+            blocks user interface; each slice lasts about
+            self.PRELOAD_SLICE milliseconds;
+            @callback, if any, is finally called with keywords
+            'images' (number of decoded images), 'busy' (time spent
+            decoding) and 'total' (time from start to end), times
+            in milliseconds;
+            optional keywords are those of self.load_images();
+        """
+        # inits
+        _steps = (
+            _count
+            for _dir in images_dirs
+            for _count in self.iter_load_images(_dir, **kw)
+        )
+        _stats = {"images": 0, "busy": 0.0, "total": 0.0}
+        _start = time.perf_counter()
+        # idle task
+        def preload_slice ():
+            # inits
+            _begin = time.perf_counter()
+            _deadline = _begin + self.PRELOAD_SLICE / 1000
+            # decode some images
+            for _count in _steps:
+                _stats["images"] += _count
+                # time is up?
+                if time.perf_counter() >= _deadline:
+                    _stats["busy"] += (time.perf_counter() - _begin) * 1000
+                    widget.after_idle(preload_slice)
+                    return
+                # end if
+            # end for
+            # all done
+            _end = time.perf_counter()
+            _stats["busy"] += (_end - _begin) * 1000
+            _stats["total"] = (_end - _start) * 1000
+            if callable(callback):
+                callback(**_stats)
+            # end if
+        # end def
+        # first slice
+        widget.after_idle(preload_slice)
+    # end def
+
+
     def is_gif (self, file_path):
         """
             determines if file_path ends with a '.gif' file extension
@@ -121,4 +422,27 @@ class TkGameImageManager:
         return file_path.lower().endswith(".gif")
     # end def
 
+
+    def trim_cache (self):
+        """
+            evicts least recently used image directories until
+            cached images fit in self.pixel_budget; pinned and
+            most recently used directories are never evicted;
+        """
+        # no limit?
+        if not self.pixel_budget:
+            return
+        # end if
+        # browse directories from least recently used
+        for _dir in list(self.loaded_dirs)[:-1]:
+            # fits in budget?
+            if self.get_stats()["pixels"] <= self.pixel_budget:
+                break
+            # end if
+            if _dir not in self.pinned_dirs:
+                self._evict_dir(_dir)
+            # end if
+        # end for
+    # end def
+
 # end class TkGameImageManager
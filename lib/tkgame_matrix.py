@@ -23,6 +23,25 @@
 """
 
 
+def new_matrix (engine=None, **kw):
+    """
+        returns a new game matrix instance using cell storage
+        @engine, one of the ENGINES keys ('dict' or 'array');
+        defaults to 'dict' if omitted;
+        raises TkGameMatrixError on unsupported engine name;
+    """
+    # param inits
+    engine = str(engine or "dict").lower()
+    # supported engine?
+    if engine in ENGINES:
+        return ENGINES[engine](**kw)
+    # end if
+    raise TkGameMatrixError(
+        "unsupported matrix storage engine '{}'.".format(engine)
+    )
+# end def
+
+
 class TkGameMatrix:
     """
         Game Matrix for Tkinter GUI environment
@@ -42,6 +61,7 @@ class TkGameMatrix:
             class constructor
         """
         self.__internal_data = dict()
+        self.changed_cells = None
         self.rows = kw.get("rows") or 0
         self.columns = kw.get("columns") or 0
         self.cellsize = kw.get("cellsize") or self.CELLSIZE
@@ -229,6 +249,10 @@ class TkGameMatrix:
         if _object:
             # silent drops...
             self.internal_data.pop(row_column, None)
+            # change tracking
+            if self.changed_cells is not None:
+                self.changed_cells.add(row_column)
+            # end if
         # error handling
         elif raise_error:
             # raise error
@@ -302,6 +326,10 @@ class TkGameMatrix:
                 if not duplicate:
                     # remove from source location
                     self.internal_data.pop(from_rowcol, None)
+                    # change tracking
+                    if self.changed_cells is not None:
+                        self.changed_cells.add(from_rowcol)
+                    # end if
                 # end if
             # no source object found
             elif raise_error:
@@ -360,6 +388,25 @@ class TkGameMatrix:
     # end def
 
 
+    def pop_changes (self):
+        """
+            returns set of (row, column) cell locations changed
+            through set_at(), drop() or move() since last call and
+            resets it; returns an empty set if change tracking is
+            disabled (see track_changes());
+        """
+        # inits
+        _changes = self.changed_cells
+        # tracking enabled?
+        if _changes is None:
+            return set()
+        # end if
+        # reset changes
+        self.changed_cells = set()
+        return _changes
+    # end def
+
+
     def rebind (self, row_column, circular=False):
         """
             rebinds (row, column) matrix location to fit into
@@ -485,6 +532,10 @@ class TkGameMatrix:
             self.columns = max(0, 0, *map(len, self.data))
             # reset internal data
             self.internal_data.clear()
+            # reset change tracking
+            if self.changed_cells is not None:
+                self.changed_cells = set()
+            # end if
             # return results
             return (self.rows, self.columns)
         # end if
@@ -513,6 +564,10 @@ class TkGameMatrix:
             sets object at row_column = (row, column);
         """
         self.internal_data[row_column] = object_
+        # change tracking
+        if self.changed_cells is not None:
+            self.changed_cells.add(row_column)
+        # end if
     # end def
 
 
@@ -521,7 +576,16 @@ class TkGameMatrix:
             sets object at xy = (x, y) converted to a common matrix
             (row, column) location;
         """
-        self.internal_data[self.row_column(xy)] = object_
+        self.set_at(self.row_column(xy), object_)
+    # end def
+
+
+    def track_changes (self, enabled=True):
+        """
+            enables or disables (row, column) cell change tracking;
+            see pop_changes();
+        """
+        self.changed_cells = set() if enabled else None
     # end def
 
 
@@ -535,6 +599,288 @@ class TkGameMatrix:
 # end class TkGameMatrix
 
 
+class TkGameArrayMatrix (TkGameMatrix):
+    """
+        Game Matrix with array-backed cell storage;
+        cells are kept in a flat preallocated list indexed by
+        row * columns + column instead of a dict keyed by
+        (row, column) tuples;
+        row offsets and column indices are precomputed in small
+        lookup tables, so that bounds checking and int/float
+        coordinates conversion cost one lookup per coordinate
+        (off-grid or non-integral coordinates raise KeyError,
+        which is caught as 'out of bounds');
+        public API remains the same as TkGameMatrix;
+    """
+
+    def __init__ (self, **kw):
+        """
+            class constructor
+        """
+        # member inits
+        self.__cells = list()
+        self.__row_offsets = dict()
+        self.__column_indices = dict()
+        # super class inits
+        super().__init__(**kw)
+        # preallocate cells if not already done
+        if not self.__cells:
+            self._allocate()
+        # end if
+    # end def
+
+
+    def _allocate (self):
+        """
+            protected method - preallocates cells and lookup tables
+            along current (rows, columns) dimensions;
+        """
+        # inits
+        _columns = self.columns
+        self.__cells = [None] * (self.rows * _columns)
+        self.__row_offsets = {
+            _row: _row * _columns for _row in range(self.rows)
+        }
+        self.__column_indices = {
+            _column: _column for _column in range(_columns)
+        }
+    # end def
+
+
+    def _index (self, row_column):
+        """
+            protected method - returns flat list index for
+            (row, column) location or -1 if out of matrix bounds;
+        """
+        # inits
+        row, column = row_column
+        try:
+            return self.__row_offsets[row] + self.__column_indices[column]
+        # out of bounds
+        except KeyError:
+            return -1
+        # end try
+    # end def
+
+
+    def at (self, row_column):
+        """
+            retrieves object at row_column = (row, column), if exists;
+        """
+        # inits (inlined for speed, see _index())
+        row, column = row_column
+        try:
+            return self.__cells[
+                self.__row_offsets[row] + self.__column_indices[column]
+            ]
+        # out of bounds
+        except KeyError:
+            return None
+        # end try
+    # end def
+
+
+    def coords (self):
+        """
+            returns list of available (row, column) coordinate tuples;
+        """
+        # inits
+        _columns = self.columns
+        return [
+            divmod(_index, _columns)
+            for _index, _object in enumerate(self.__cells)
+            if _object is not None
+        ]
+    # end def
+
+
+    @property
+    def internal_data (self):
+        """
+            matrix internal data (READ-ONLY property);
+        """
+        return self.__cells
+    # end def
+
+    @internal_data.setter
+    def internal_data (self, value):
+        """
+            forbidden - READ-ONLY internal data
+        """
+        raise TkGameMatrixError(
+            "'internal_data' attribute is READ-ONLY."
+        )
+    # end def
+
+
+    def drop (self, row_column, raise_error=False):
+        """
+            deletes object located at (row, column);
+            if @raise_error is True and no object found, raises
+            TkGameMatrixCellError;
+        """
+        # inits
+        _index = self._index(row_column)
+        # got something to delete?
+        if _index >= 0 and self.__cells[_index]:
+            # silent drops...
+            self.__cells[_index] = None
+            # change tracking
+            if self.changed_cells is not None:
+                self.changed_cells.add(row_column)
+            # end if
+        # error handling
+        elif raise_error:
+            # raise error
+            raise TkGameMatrixCellError(
+                "while trying to delete: "
+                "no object found in matrix cell."
+            )
+        # end if
+    # end def
+
+
+    def move (self, from_rowcol, to_rowcol, raise_error=False, duplicate=False):
+        """
+            absolute move from (row0, column0) to (row1, column1);
+            if @raise_error is True:
+            - raises TkGameMatrixCellError if destination is not None,
+            - raises TkGameMatrixCellError if source is None;
+        """
+        # inits (inlined for speed, see _index())
+        _cells = self.__cells
+        _row_offsets = self.__row_offsets
+        _column_indices = self.__column_indices
+        row, column = from_rowcol
+        try:
+            _from = _row_offsets[row] + _column_indices[column]
+        except KeyError:
+            _from = -1
+        # end try
+        row, column = to_rowcol
+        try:
+            _to = _row_offsets[row] + _column_indices[column]
+        except KeyError:
+            _to = -1
+        # end try
+        # error handling
+        if raise_error and _to >= 0 and _cells[_to]:
+            raise TkGameMatrixCellError(
+                "while trying to move/duplicate: "
+                "destination cell is busy."
+            )
+        # end if
+        # look for source object
+        _object = _cells[_from] if _from >= 0 else None
+        # got something?
+        if _object:
+            # destination out of bounds?
+            if _to < 0:
+                raise TkGameMatrixCellError(
+                    "while trying to move/duplicate: "
+                    "destination cell is out of matrix bounds."
+                )
+            # end if
+            # move it!
+            _cells[_to] = _object
+            # no duplication (simple move)?
+            if not duplicate:
+                # remove from source location
+                _cells[_from] = None
+            # end if
+            # change tracking
+            if self.changed_cells is not None:
+                self.changed_cells.add(to_rowcol)
+                if not duplicate:
+                    self.changed_cells.add(from_rowcol)
+                # end if
+            # end if
+        # no source object found
+        elif raise_error:
+            # error handling
+            raise TkGameMatrixCellError(
+                "while trying to move/duplicate: "
+                "no object found in source cell."
+            )
+        # end if
+    # end def
+
+
+    def objects (self):
+        """
+            returns list of matrix' registered objects;
+        """
+        return [_object for _object in self.__cells if _object is not None]
+    # end def
+
+
+    def rel_at (self, from_rowcol, rel_rowcol):
+        """
+            retrieves object at relative location, if exists;
+        """
+        # inits
+        row, column = from_rowcol
+        # relative_row, relative_column
+        rr, rc = rel_rowcol
+        try:
+            return self.__cells[
+                self.__row_offsets[row + rr]
+                + self.__column_indices[column + rc]
+            ]
+        # out of bounds
+        except KeyError:
+            return None
+        # end try
+    # end def
+
+
+    def resize (self, matrix_data):
+        """
+            resizes inner matrix (rows, columns) along with
+            @matrix_data;
+            this parameter must be at least a list of iterables;
+        """
+        # super class inits
+        _dims = super().resize(matrix_data)
+        # param controls
+        if matrix_data:
+            # preallocate cells
+            self._allocate()
+        # end if
+        return _dims
+    # end def
+
+
+    def set_at (self, row_column, object_):
+        """
+            sets object at row_column = (row, column);
+            raises TkGameMatrixCellError if out of matrix bounds;
+        """
+        # inits
+        _index = self._index(row_column)
+        if _index < 0:
+            raise TkGameMatrixCellError(
+                "while trying to set: "
+                "matrix cell is out of matrix bounds."
+            )
+        # end if
+        self.__cells[_index] = object_
+        # change tracking
+        if self.changed_cells is not None:
+            self.changed_cells.add(row_column)
+        # end if
+    # end def
+
+# end class TkGameArrayMatrix
+
+
+# supported cell storage engines
+ENGINES = {
+    "dict": TkGameMatrix,
+    "array": TkGameArrayMatrix,
+}
+
+
 # exception handling
 
 class TkGameMatrixError (Exception):
@@ -122,7 +122,9 @@ class TkGameMatrixSprite (CS.TkGameCanvasSprite):
         # but you can reimplement this in your own subclasses
         dx, dy = c_dict["rel_xy"]
         # relative move on canvas
-        self.canvas.move(self.canvas_id, dx, dy)
+        if self.canvas_id:
+            self.canvas.move(self.canvas_id, dx, dy)
+        # end if
         # update matrix
         self.matrix.rel_move_xy(self.xy, (dx, dy))
         # update pos
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    tkBoulderDash - Python3-Tkinter port of 'Boulder Dash' game
+
+    Python3-Tkinter port by Raphaël Seban <motus@laposte.net>
+
+    Copyright (c) 2014+ Raphaël Seban for the present code
+
+    This program is free software: you can redistribute it and/or
+    modify it under the terms of the GNU General Public License as
+    published by the Free Software Foundation, either version 3 of
+    the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+    General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.
+
+    If not, see http://www.gnu.org/licenses/
+"""
+
+"""
+    headless game engine benchmark: runs each game level with
+    random player inputs and reports simulated game steps per
+    second;
+
+    usage (from project's root directory):
+
+        python3 -m tools.bench_engine
+"""
+
+# lib imports
+import random
+import time
+from lib import game_engine as GE
+
+
+# level data files
+TPL_LEVEL_FILE = "data/json/level_{}.json"
+LEVELS = range(1, 8)
+
+# number of game steps per level
+TICKS = 20000
+
+
+def main ():
+    """
+        runs benchmark for each game level;
+    """
+    # inits
+    _inputs = (None, None, "Up", "Down", "Left", "Right")
+    # loop on levels
+    for _level in LEVELS:
+        # inits
+        _random = random.Random(_level)
+        _engine = GE.GameEngine(seed=_level)
+        _fpath = TPL_LEVEL_FILE.format(_level)
+        _games = 0
+        _events = 0
+        _start = time.perf_counter()
+        # run simulation
+        for _tick in range(TICKS):
+            # (re)start level
+            if _engine.status != "playing":
+                _engine.load_data(_fpath)
+                _games += 1
+            # end if
+            _events += len(_engine.step(_random.choice(_inputs)))
+        # end for
+        _elapsed = time.perf_counter() - _start
+        print(
+            "level {}: {} ticks, {:>4} games, {:>6} events  "
+            "{:>10,.0f} ticks/s"
+            .format(_level, TICKS, _games, _events, TICKS / _elapsed)
+        )
+    # end for
+# end def
+
+
+# self-launch script
+if __name__ == "__main__":
+    main()
+# end if
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    tkBoulderDash - Python3-Tkinter port of 'Boulder Dash' game
+
+    Python3-Tkinter port by Raphaël Seban <motus@laposte.net>
+
+    Copyright (c) 2014+ Raphaël Seban for the present code
+
+    This program is free software: you can redistribute it and/or
+    modify it under the terms of the GNU General Public License as
+    published by the Free Software Foundation, either version 3 of
+    the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+    General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.
+
+    If not, see http://www.gnu.org/licenses/
+"""
+
+"""
+    event manager microbenchmark: raises 1M events through legacy
+    set-rebuilding dispatch and through current event manager;
+
+    usage (from project's root directory):
+
+        python3 -m tools.bench_events
+"""
+
+# lib imports
+import time
+from lib import tkgame_events as EM
+
+
+# number of raised events per measure
+EVENTS = 1000000
+
+# (label, number of connected slots) cases
+CASES = (
+    ("no slot", 0),
+    ("1 slot", 1),
+    ("3 slots", 3),
+)
+
+
+class LegacyEventManager (EM.TkGameEventManager):
+    """
+        event manager with former raise_event() dispatch path;
+    """
+
+    def raise_event (self, signal, *args, **kw):
+        """
+            former dispatch: rebuilds, stores and copies the set
+            of slots on each call;
+        """
+        # get signal current set of slots
+        _slots = self.connections.get(signal)
+        # signal do exist and has a set of slots
+        if _slots and isinstance(_slots, set):
+            # keep only callable slots
+            _slots = set(filter(callable, _slots))
+            # update signal slots collection
+            self.connections[signal] = _slots
+            # browse the set
+            for _slot in _slots.copy():
+                _slot(*args, **kw)
+            # end for
+            return True
+        # end if
+        return False
+    # end def
+
+# end class LegacyEventManager
+
+
+def new_slot ():
+    """
+        returns a new no-op slot;
+    """
+    return lambda *args, **kw: None
+# end def
+
+
+def bench_raise (manager, slots):
+    """
+        returns raised events per second for @slots connected slots;
+    """
+    # inits
+    manager.connect("Game:Rock:Moved", *(new_slot() for i in range(slots)))
+    _raise = manager.raise_event
+    _start = time.perf_counter()
+    # measure
+    for i in range(EVENTS):
+        _raise("Game:Rock:Moved", sprite=None)
+    # end for
+    return EVENTS / (time.perf_counter() - _start)
+# end def
+
+
+def main ():
+    """
+        runs benchmark for each case;
+    """
+    print("raise_event() ({:,} events per measure):".format(EVENTS))
+    # loop on cases
+    for _label, _slots in CASES:
+        _old = bench_raise(LegacyEventManager(), _slots)
+        _new = bench_raise(EM.TkGameEventManager(), _slots)
+        print(
+            "    {:<8} legacy: {:>11,.0f} events/s    "
+            "compiled: {:>11,.0f} events/s    x{:.1f}"
+            .format(_label, _old, _new, _new / _old)
+        )
+    # end for
+# end def
+
+
+# self-launch script
+if __name__ == "__main__":
+    main()
+# end if
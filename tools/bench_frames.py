@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    tkBoulderDash - Python3-Tkinter port of 'Boulder Dash' game
+
+    Python3-Tkinter port by Raphaël Seban <motus@laposte.net>
+
+    Copyright (c) 2014+ Raphaël Seban for the present code
+
+    This program is free software: you can redistribute it and/or
+    modify it under the terms of the GNU General Public License as
+    published by the Free Software Foundation, either version 3 of
+    the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+    General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.
+
+    If not, see http://www.gnu.org/licenses/
+"""
+
+"""
+    sprite frame-flip microbenchmark: compares per-frame path
+    building + image dict lookup against indexed frames tables;
+
+    no display is needed: image files are registered with dummy
+    objects in place of tkinter PhotoImage instances;
+
+    usage (from project's root directory):
+
+        python3 -m tools.bench_frames
+"""
+
+# lib imports
+import os
+import os.path as OP
+import time
+from lib import tkgame_images as IM
+
+
+# sprites images directory
+IMAGES_DIR = "images/sprites"
+
+# number of frame flips per measure
+FLIPS = 500000
+
+
+def register_images (manager, images_dir):
+    """
+        registers dummy images for all GIF files found in
+        @images_dir subdirectories; returns {subdir: states} dict;
+    """
+    # inits
+    _dirs = dict()
+    # browse subdirs
+    for _name in sorted(os.listdir(images_dir)):
+        _dir = OP.abspath(OP.join(images_dir, _name))
+        if OP.isdir(_dir):
+            _states = set()
+            for _file in os.listdir(_dir):
+                if manager.is_gif(_file):
+                    manager.images[OP.join(_dir, _file)] = object()
+                    _states.add(_file.rsplit("_", 1)[0])
+                # end if
+            # end for
+            _dirs[_dir] = sorted(_states)
+        # end if
+    # end for
+    return _dirs
+# end def
+
+
+def bench_paths (manager, images_dir, state, count):
+    """
+        returns frame flips per second with path building;
+    """
+    # inits
+    _get_image = manager.get_image
+    _counter = 0
+    _start = time.perf_counter()
+    # measure
+    for i in range(FLIPS):
+        _image = _get_image(
+            OP.abspath(
+                OP.join(images_dir, "{}_{}.gif".format(state, _counter))
+            )
+        )
+        _counter = (_counter + 1) % count
+    # end for
+    return FLIPS / (time.perf_counter() - _start)
+# end def
+
+
+def bench_frames (manager, images_dir, state, count):
+    """
+        returns frame flips per second with indexed frames table;
+    """
+    # inits
+    _table = manager.get_frames(images_dir, (state,))
+    _counter = 0
+    _start = time.perf_counter()
+    # measure
+    for i in range(FLIPS):
+        _frames = _table.get(state, ())
+        if _counter < len(_frames):
+            _image = _frames[_counter]
+        # end if
+        _counter = (_counter + 1) % count
+    # end for
+    return FLIPS / (time.perf_counter() - _start)
+# end def
+
+
+def main ():
+    """
+        runs benchmark on each animated sprite directory;
+    """
+    # inits
+    _manager = IM.TkGameImageManager()
+    _dirs = register_images(_manager, IMAGES_DIR)
+    print("frame flips ({} per measure):".format(FLIPS))
+    # browse sprites
+    for _dir, _states in _dirs.items():
+        for _state in _states:
+            _count = len(_manager.get_frames(_dir, (_state,))[_state])
+            # animated only
+            if _count > 1:
+                _old = bench_paths(_manager, _dir, _state, _count)
+                _new = bench_frames(_manager, _dir, _state, _count)
+                print(
+                    "    {:<24} paths: {:>11,.0f} flips/s    "
+                    "frames: {:>11,.0f} flips/s    x{:.1f}"
+                    .format(
+                        "{}/{}".format(OP.basename(_dir), _state),
+                        _old, _new, _new / _old
+                    )
+                )
+            # end if
+        # end for
+    # end for
+# end def
+
+
+# self-launch script
+if __name__ == "__main__":
+    main()
+# end if
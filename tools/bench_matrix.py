@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    tkBoulderDash - Python3-Tkinter port of 'Boulder Dash' game
+
+    Python3-Tkinter port by Raphaël Seban <motus@laposte.net>
+
+    Copyright (c) 2014+ Raphaël Seban for the present code
+
+    This program is free software: you can redistribute it and/or
+    modify it under the terms of the GNU General Public License as
+    published by the Free Software Foundation, either version 3 of
+    the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+    General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.
+
+    If not, see http://www.gnu.org/licenses/
+"""
+
+"""
+    game matrix microbenchmark: compares lookup and move
+    throughput of 'dict' and 'array' cell storage engines;
+
+    usage (from project's root directory):
+
+        python3 -m tools.bench_matrix
+"""
+
+# lib imports
+import random
+import time
+from lib import tkgame_matrix as MX
+
+
+# benchmark grids (name, rows, columns)
+GRIDS = (
+    ("20x60 level", 20, 60),
+    ("1000x1000 synthetic", 1000, 1000),
+)
+
+# number of operations per measure
+OPERATIONS = 200000
+
+
+def build_matrix (engine, rows, columns):
+    """
+        returns a new matrix half-filled with dummy objects;
+    """
+    # inits
+    _matrix = MX.new_matrix(engine, data=[" " * columns] * rows)
+    _random = random.Random(rows * columns)
+    # fill matrix
+    for _row in range(rows):
+        for _column in range(columns):
+            if _random.random() < 0.5:
+                _matrix.set_at((_row, _column), object())
+            # end if
+        # end for
+    # end for
+    return _matrix
+# end def
+
+
+def bench_lookups (matrix, cells):
+    """
+        returns at() + rel_at() operations per second;
+    """
+    # inits
+    _at, _rel_at = matrix.at, matrix.rel_at
+    _start = time.perf_counter()
+    # measure
+    for _rc in cells:
+        _at(_rc)
+        _rel_at(_rc, (+1, 0))
+    # end for
+    return 2 * len(cells) / (time.perf_counter() - _start)
+# end def
+
+
+def bench_moves (matrix, cells):
+    """
+        returns move() + reverse move() operations per second;
+    """
+    # inits
+    _move = matrix.move
+    _start = time.perf_counter()
+    # measure
+    for (_row, _column) in cells:
+        _move((_row, _column), (_row, _column + 1))
+        _move((_row, _column + 1), (_row, _column))
+    # end for
+    return 2 * len(cells) / (time.perf_counter() - _start)
+# end def
+
+
+def main ():
+    """
+        runs benchmark for each grid and engine;
+    """
+    # loop on grids
+    for _name, _rows, _columns in GRIDS:
+        # inits
+        _random = random.Random(0)
+        _cells = [
+            (_random.randrange(_rows - 1), _random.randrange(_columns - 1))
+            for i in range(OPERATIONS)
+        ]
+        print("{} ({} ops):".format(_name, OPERATIONS))
+        # loop on engines
+        for _engine in sorted(MX.ENGINES):
+            _matrix = build_matrix(_engine, _rows, _columns)
+            print(
+                "    {:<6} lookups: {:>12,.0f} ops/s    "
+                "moves: {:>12,.0f} ops/s"
+                .format(
+                    _engine,
+                    bench_lookups(_matrix, _cells),
+                    bench_moves(_matrix, _cells),
+                )
+            )
+        # end for
+    # end for
+# end def
+
+
+# self-launch script
+if __name__ == "__main__":
+    main()
+# end if
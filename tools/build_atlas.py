@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    tkBoulderDash - Python3-Tkinter port of 'Boulder Dash' game
+
+    Python3-Tkinter port by Raphaël Seban <motus@laposte.net>
+
+    Copyright (c) 2014+ Raphaël Seban for the present code
+
+    This program is free software: you can redistribute it and/or
+    modify it under the terms of the GNU General Public License as
+    published by the Free Software Foundation, either version 3 of
+    the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+    General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.
+
+    If not, see http://www.gnu.org/licenses/
+"""
+
+"""
+    sprite-sheet atlas builder: packs all GIF frames of each sprite
+    family directory into one PNG atlas image plus a JSON index of
+    frame rectangles (see tkgame_images.TkGameImageManager);
+
+    pure Python: no display and no third-party package needed;
+
+    usage (from project's root directory):
+
+        python3 -m tools.build_atlas [--check] [images_dir ...]
+
+    images_dir defaults to 'images/sprites'; each subdirectory is
+    packed on its own; option --check only reports outdated atlases;
+"""
+
+# lib imports
+import hashlib
+import json
+import os
+import os.path as OP
+import struct
+import sys
+import zlib
+from lib import tkgame_images as IM
+
+
+# default images root directory
+IMAGES_DIR = "images/sprites"
+
+# max frames per atlas row
+ATLAS_COLUMNS = 16
+
+
+def decode_gif (file_path):
+    """
+        decodes first image of a GIF file;
+        returns (width, height, RGBA pixels bytearray);
+    """
+    # inits
+    with open(file_path, "rb") as file_in:
+        _data = file_in.read()
+    # end with
+    if _data[:6] not in (b"GIF87a", b"GIF89a"):
+        raise ValueError("not a GIF file: '{}'".format(file_path))
+    # end if
+    _width, _height, _flags = struct.unpack_from("<HHB", _data, 6)
+    _pos = 13
+    _palette = b""
+    _transparent = None
+    # global color table
+    if _flags & 0x80:
+        _size = 3 << ((_flags & 7) + 1)
+        _palette = _data[_pos:_pos + _size]
+        _pos += _size
+    # end if
+    # browse blocks
+    while _pos < len(_data):
+        _block = _data[_pos]
+        _pos += 1
+        # extension
+        if _block == 0x21:
+            _label = _data[_pos]
+            _pos += 1
+            # graphic control extension
+            if _label == 0xF9 and _data[_pos + 1] & 1:
+                _transparent = _data[_pos + 4]
+            # end if
+            _pos = skip_sub_blocks(_data, _pos)
+        # image descriptor
+        elif _block == 0x2C:
+            _left, _top, _w, _h, _iflags = struct.unpack_from(
+                "<HHHHB", _data, _pos
+            )
+            _pos += 9
+            # local color table
+            if _iflags & 0x80:
+                _size = 3 << ((_iflags & 7) + 1)
+                _palette = _data[_pos:_pos + _size]
+                _pos += _size
+            # end if
+            _min_size = _data[_pos]
+            _pos += 1
+            _lzw = bytearray()
+            while _data[_pos]:
+                _lzw += _data[_pos + 1:_pos + 1 + _data[_pos]]
+                _pos += 1 + _data[_pos]
+            # end while
+            _indexes = lzw_decode(bytes(_lzw), _min_size)
+            _rows = list(range(_h))
+            # interlaced rows order
+            if _iflags & 0x40:
+                _rows = (
+                    _rows[0::8] + _rows[4::8] + _rows[2::4] + _rows[1::2]
+                )
+            # end if
+            # compose RGBA pixels (outside of image is transparent)
+            _pixels = bytearray(_width * _height * 4)
+            for _i, _row in enumerate(_rows):
+                _y = _top + _row
+                for _x in range(_w):
+                    _index = _indexes[_i * _w + _x]
+                    if _index == _transparent or _y >= _height:
+                        continue
+                    # end if
+                    _offset = (_y * _width + _left + _x) * 4
+                    _pixels[_offset:_offset + 4] = (
+                        _palette[_index * 3:_index * 3 + 3] + b"\xff"
+                    )
+                # end for
+            # end for
+            return (_width, _height, _pixels)
+        # trailer
+        else:
+            break
+        # end if
+    # end while
+    raise ValueError("no image found in '{}'".format(file_path))
+# end def
+
+
+def encode_png (file_path, width, height, pixels):
+    """
+        writes RGBA @pixels as a PNG file;
+    """
+    # inits
+    def chunk (tag, data):
+        return (
+            struct.pack(">I", len(data)) + tag + data
+            + struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff)
+        )
+    # end def
+    _stride = width * 4
+    _raw = b"".join(
+        b"\x00" + bytes(pixels[_y * _stride:(_y + 1) * _stride])
+        for _y in range(height)
+    )
+    with open(file_path, "wb") as file_out:
+        file_out.write(b"\x89PNG\r\n\x1a\n")
+        file_out.write(
+            chunk(
+                b"IHDR",
+                struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+            )
+        )
+        file_out.write(chunk(b"IDAT", zlib.compress(_raw, 9)))
+        file_out.write(chunk(b"IEND", b""))
+    # end with
+# end def
+
+
+def lzw_decode (data, min_size):
+    """
+        decodes GIF LZW @data; returns color indexes bytearray;
+    """
+    # inits
+    _clear = 1 << min_size
+    _end = _clear + 1
+    _size = min_size + 1
+    _table = [bytes((i,)) for i in range(_clear)] + [b"", b""]
+    _output = bytearray()
+    _previous = None
+    _bits = int.from_bytes(data, "little")
+    _pos = 0
+    _total = len(data) * 8
+    # browse codes
+    while _pos + _size <= _total:
+        _code = (_bits >> _pos) & ((1 << _size) - 1)
+        _pos += _size
+        if _code == _clear:
+            _size = min_size + 1
+            del _table[_clear + 2:]
+            _previous = None
+            continue
+        elif _code == _end:
+            break
+        # end if
+        if _previous is None:
+            _entry = _table[_code]
+        else:
+            if _code < len(_table):
+                _entry = _table[_code]
+            else:
+                _entry = _previous + _previous[:1]
+            # end if
+            if len(_table) < 4096:
+                _table.append(_previous + _entry[:1])
+            # end if
+        # end if
+        _output += _entry
+        _previous = _entry
+        if len(_table) == (1 << _size) and _size < 12:
+            _size += 1
+        # end if
+    # end while
+    return _output
+# end def
+
+
+def skip_sub_blocks (data, pos):
+    """
+        returns position past GIF data sub-blocks at @pos;
+    """
+    while data[pos]:
+        pos += 1 + data[pos]
+    # end while
+    return pos + 1
+# end def
+
+
+def get_sources (images_dir):
+    """
+        returns sorted list of GIF frame file names in @images_dir;
+    """
+    return sorted(
+        _name for _name in os.listdir(images_dir)
+        if _name.lower().endswith(".gif")
+        and OP.isfile(OP.join(images_dir, _name))
+    )
+# end def
+
+
+def is_outdated (images_dir):
+    """
+        determines if @images_dir atlas is missing or does not
+        match current frame files (names and sizes);
+    """
+    # inits
+    _index_path = OP.join(images_dir, IM.ATLAS_INDEX)
+    try:
+        with open(_index_path) as file_in:
+            _index = json.load(file_in)
+        # end with
+    except (OSError, ValueError):
+        return True
+    # end try
+    _sources = {
+        _name: OP.getsize(OP.join(images_dir, _name))
+        for _name in get_sources(images_dir)
+    }
+    return _index.get("sources") != _sources
+# end def
+
+
+def build_atlas (images_dir):
+    """
+        packs @images_dir GIF frames into one atlas;
+        identical frames share the same atlas rectangle;
+        each frame gets a content hash of its decoded pixels, so
+        that image manager may share identical frames across
+        sprite families;
+        returns number of packed frames;
+    """
+    # inits
+    _names = get_sources(images_dir)
+    if not _names:
+        return 0
+    # end if
+    _decoded = [decode_gif(OP.join(images_dir, _name)) for _name in _names]
+    _hashes = [
+        hashlib.sha1(
+            struct.pack("<HH", _w, _h) + bytes(_p)
+        ).hexdigest()
+        for _w, _h, _p in _decoded
+    ]
+    _unique = list(dict.fromkeys(_hashes))
+    _cell_w = max(_w for _w, _h, _p in _decoded)
+    _cell_h = max(_h for _w, _h, _p in _decoded)
+    _columns = min(ATLAS_COLUMNS, len(_unique))
+    _rows = (len(_unique) + _columns - 1) // _columns
+    _width, _height = _columns * _cell_w, _rows * _cell_h
+    _pixels = bytearray(_width * _height * 4)
+    _rects = dict()
+    _frames = dict()
+    # copy frames
+    for _name, (_w, _h, _p), _hash in zip(_names, _decoded, _hashes):
+        # not already packed?
+        if _hash not in _rects:
+            _i = len(_rects)
+            _x0 = (_i % _columns) * _cell_w
+            _y0 = (_i // _columns) * _cell_h
+            for _y in range(_h):
+                _offset = ((_y0 + _y) * _width + _x0) * 4
+                _pixels[_offset:_offset + _w * 4] = (
+                    _p[_y * _w * 4:(_y + 1) * _w * 4]
+                )
+            # end for
+            _rects[_hash] = [_x0, _y0, _w, _h]
+        # end if
+        _frames[_name] = _rects[_hash] + [_hash]
+    # end for
+    # write atlas image and index
+    encode_png(OP.join(images_dir, IM.ATLAS_IMAGE), _width, _height, _pixels)
+    with open(OP.join(images_dir, IM.ATLAS_INDEX), "w") as file_out:
+        json.dump(
+            {
+                "image": IM.ATLAS_IMAGE,
+                "frames": _frames,
+                "sources": {
+                    _name: OP.getsize(OP.join(images_dir, _name))
+                    for _name in _names
+                },
+            },
+            file_out, indent=1, sort_keys=True,
+        )
+    # end with
+    return len(_names)
+# end def
+
+
+def main ():
+    """
+        builds (or checks) atlases for each sprite family;
+    """
+    # inits
+    _args = sys.argv[1:]
+    _check = "--check" in _args
+    _roots = [_arg for _arg in _args if _arg != "--check"] or [IMAGES_DIR]
+    _outdated = 0
+    # browse sprite families
+    for _root in _roots:
+        for _name in sorted(os.listdir(_root)):
+            _dir = OP.join(_root, _name)
+            if not OP.isdir(_dir):
+                continue
+            # end if
+            if _check:
+                if is_outdated(_dir):
+                    _outdated += 1
+                    print("outdated: {}".format(_dir))
+                # end if
+            else:
+                print("{}: {} frames".format(_dir, build_atlas(_dir)))
+            # end if
+        # end for
+    # end for
+    if _outdated:
+        exit("{} outdated atlas(es).".format(_outdated))
+    # end if
+# end def
+
+
+# self-launch script
+if __name__ == "__main__":
+    main()
+# end if
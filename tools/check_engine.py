@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    tkBoulderDash - Python3-Tkinter port of 'Boulder Dash' game
+
+    Python3-Tkinter port by Raphaël Seban <motus@laposte.net>
+
+    Copyright (c) 2014+ Raphaël Seban for the present code
+
+    This program is free software: you can redistribute it and/or
+    modify it under the terms of the GNU General Public License as
+    published by the Free Software Foundation, either version 3 of
+    the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+    General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.
+
+    If not, see http://www.gnu.org/licenses/
+"""
+
+"""
+    game engine conformance check: runs each game level through
+    both the sprite classes (ObjectMapper) and the headless game
+    engine (GameEngine) with the same random player inputs, then
+    compares grid contents after each game step;
+
+    falling rules are shared by both sides (see GameRules), so
+    this checks their hook methods along with player moves;
+
+    timers (zombie AI, countdowns, openings) are not run on either
+    side, so that only player moves and falling physics are checked;
+
+    needs a display (tkinter images and canvas);
+
+    usage (from project's root directory):
+
+        python3 -m tools.check_engine
+"""
+
+# lib imports
+import random
+import sys
+import tkinter as TK
+from lib import game_engine as GE
+from lib import object_mapper as OM
+from lib import tkgame_animations as AP
+from lib import tkgame_canvas as CV
+from lib import tkgame_events as EM
+
+
+# level files
+TPL_LEVEL_FILE = "data/json/level_{}.json"
+LEVELS = range(1, 8)
+
+# game steps per level
+STEPS = 300
+
+# player inputs (sprite method, engine relative move)
+INPUTS = (
+    ("move_up", (-1, 0)),
+    ("move_down", (+1, 0)),
+    ("move_left", (0, -1)),
+    ("move_right", (0, +1)),
+)
+
+
+def engine_grid (engine):
+    """
+        returns {(row, column): name} grid contents of @engine;
+    """
+    return {
+        (_obj.row, _obj.column): _obj.name for _obj in engine.objects()
+    }
+# end def
+
+
+def sprites_grid (objects):
+    """
+        returns {(row, column): name} grid contents of @objects
+        ObjectMapper, along TkBD{name}Sprite naming convention;
+    """
+    return {
+        tuple(_sprite.row_column): _sprite.__class__.__name__[4:-6]
+        for _sprite in objects.matrix.objects()
+    }
+# end def
+
+
+def main ():
+    """
+        runs conformance check; exits with error status on any
+        mismatch;
+    """
+    # inits
+    _root = TK.Tk()
+    _root.withdraw()
+    _canvas = CV.TkGameCanvas(_root)
+    _animations = AP.get_animation_pool()
+    _events = EM.get_event_manager()
+    _objects = OM.ObjectMapper(_canvas, images_dir="images/sprites")
+    _engine = GE.GameEngine()
+    _failed = 0
+    # loop on levels
+    for _level in LEVELS:
+        # clear up previous level (see GamePlay.clear_canvas())
+        _events.disconnect_group("Game:")
+        _animations.clear_all()
+        _canvas.clear()
+        # load level on both sides
+        _objects.load_data(TPL_LEVEL_FILE.format(_level))
+        _objects.start_sprites()
+        _engine.load_data(TPL_LEVEL_FILE.format(_level))
+        _random = random.Random(_level)
+        _mismatch = None
+        # loop on game steps
+        for _step in range(STEPS):
+            # same player input on both sides
+            # (GamePlay drops inputs once player is dead)
+            _method, (_sr, _sc) = _random.choice(INPUTS)
+            if _objects.player_sprite.state not in ("frozen", "splashed"):
+                getattr(_objects.player_sprite, _method)()
+            # end if
+            _engine.move_player(_sr, _sc)
+            # physics step
+            _objects.update_falldown()
+            _engine.update_falldown()
+            # compare grids
+            _sprites, _cells = sprites_grid(_objects), engine_grid(_engine)
+            if _sprites != _cells:
+                _mismatch = sorted(
+                    (_rc, _sprites.get(_rc), _cells.get(_rc))
+                    for _rc in set(_sprites) | set(_cells)
+                    if _sprites.get(_rc) != _cells.get(_rc)
+                )
+                break
+            # end if
+        # end for
+        # report
+        if _mismatch:
+            _failed += 1
+            print(
+                "level {}: MISMATCH at step {} (cell, sprites, engine): {}"
+                .format(_level, _step + 1, _mismatch[:5])
+            )
+        else:
+            print("level {}: {} steps OK".format(_level, STEPS))
+        # end if
+    # end for
+    _root.destroy()
+    # mismatches found?
+    if _failed:
+        sys.exit("FAILED: {} level(s) differ.".format(_failed))
+    # end if
+    print("OK: engine matches sprites.")
+# end def
+
+
+# self-launch script
+if __name__ == "__main__":
+    main()
+# end if
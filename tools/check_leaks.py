@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    tkBoulderDash - Python3-Tkinter port of 'Boulder Dash' game
+
+    Python3-Tkinter port by Raphaël Seban <motus@laposte.net>
+
+    Copyright (c) 2014+ Raphaël Seban for the present code
+
+    This program is free software: you can redistribute it and/or
+    modify it under the terms of the GNU General Public License as
+    published by the Free Software Foundation, either version 3 of
+    the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+    General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.
+
+    If not, see http://www.gnu.org/licenses/
+"""
+
+"""
+    sprite leak check: loads and starts all game levels in sequence,
+    clearing up each level the way GamePlay does, then checks the
+    number of live sprite objects stays flat i.e. previous level
+    sprites have all been garbage collected;
+
+    needs a display (tkinter images and canvas);
+
+    usage (from project's root directory):
+
+        python3 -m tools.check_leaks
+"""
+
+# lib imports
+import gc
+import sys
+import tkinter as TK
+from lib import object_mapper as OM
+from lib import tkgame_animations as AP
+from lib import tkgame_canvas as CV
+from lib import tkgame_canvas_sprite as CS
+from lib import tkgame_events as EM
+
+
+# level files
+TPL_LEVEL_FILE = "data/json/level_{}.json"
+LEVELS = range(1, 8)
+
+# number of passes over all levels
+PASSES = 2
+
+
+def count_live_sprites ():
+    """
+        returns number of live sprite objects after full garbage
+        collection;
+    """
+    gc.collect()
+    return sum(
+        1 for _object in gc.get_objects()
+        if isinstance(_object, CS.TkGameCanvasSprite)
+    )
+# end def
+
+
+def main ():
+    """
+        runs leak check; exits with error status on leaks;
+    """
+    # inits
+    _root = TK.Tk()
+    _root.withdraw()
+    _canvas = CV.TkGameCanvas(_root)
+    _animations = AP.get_animation_pool()
+    _events = EM.get_event_manager()
+    _objects = OM.ObjectMapper(_canvas, images_dir="images/sprites")
+    _leaks = 0
+    # loop on passes and levels
+    for _pass in range(PASSES):
+        for _level in LEVELS:
+            # clear up previous level (see GamePlay.clear_canvas())
+            _events.disconnect_group("Game:")
+            _events.disconnect_group("Main:Game:")
+            _animations.clear_all()
+            _canvas.clear()
+            # load and start level
+            _objects.load_data(TPL_LEVEL_FILE.format(_level))
+            _objects.start_sprites()
+            # check for stale sprites
+            _count = len(list(_objects.matrix.objects()))
+            _live = count_live_sprites()
+            _leaks = max(_leaks, _live - _count)
+            print(
+                "pass {} level {}: {:>5} sprites    {:>6} live    "
+                "{:>6} stale"
+                .format(_pass + 1, _level, _count, _live, _live - _count)
+            )
+        # end for
+    # end for
+    _root.destroy()
+    # leaks found?
+    if _leaks:
+        sys.exit("FAILED: up to {} stale sprites kept alive.".format(_leaks))
+    # end if
+    print("OK: no stale sprites.")
+# end def
+
+
+# self-launch script
+if __name__ == "__main__":
+    main()
+# end if